@@ -45,6 +45,9 @@ try:
 except ImportError:
     yaml = None
 
+if yaml:
+    _Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 def get_state_dir() -> Path:
     """Get the reflect state directory."""
@@ -67,7 +70,7 @@ def load_state() -> dict:
 
     if yaml:
         with open(state_file) as f:
-            return yaml.safe_load(f) or {}
+            return yaml.load(f, Loader=_Loader) or {}
     else:
         # Fallback: basic parsing
         return {'auto_reflect': False}
@@ -25,6 +25,12 @@ except ImportError:
     print("PyYAML required. Install with: pip install pyyaml")
     sys.exit(1)
 
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    # No libyaml: fall back silently, hooks import this on every run
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
 
 def get_state_dir() -> Path:
     """Return state directory, configurable via env or default."""
@@ -52,7 +58,7 @@ def load_metrics() -> dict:
         return get_default_metrics()
 
     with open(metrics_file, 'r') as f:
-        return yaml.safe_load(f) or get_default_metrics()
+        return yaml.load(f, Loader=_Loader) or get_default_metrics()
 
 
 def save_metrics(metrics: dict) -> None:
@@ -61,7 +67,7 @@ def save_metrics(metrics: dict) -> None:
     metrics_file.parent.mkdir(parents=True, exist_ok=True)
 
     with open(metrics_file, 'w') as f:
-        yaml.dump(metrics, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(metrics, f, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
 
 
 def get_default_metrics() -> dict:
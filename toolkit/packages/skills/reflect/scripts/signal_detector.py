@@ -16,6 +16,11 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class Confidence(Enum):
     HIGH = "HIGH"
@@ -33,9 +38,9 @@ class Category(Enum):
     UNKNOWN = "Unknown"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Signal:
-    """A detected signal from conversation."""
+    """A detected signal from conversation (slotted and immutable)."""
     signal: str
     confidence: Confidence
     source_quote: str
@@ -103,6 +108,26 @@ CATEGORY_PATTERNS = {
 }
 
 
+# Split CATEGORY_PATTERNS into single-word triggers, resolved with one dict
+# lookup per token, and phrase patterns that still need a regex search.
+# Earlier categories win, exactly as in the original ordered regex scan.
+_WORD_ALTERNATION = re.compile(r'\\b\(([\w|]+)\)\\b')
+_TOKEN_SPLIT = re.compile(r'\W+')
+
+CATEGORY_RANK = {category: rank for rank, category in enumerate(CATEGORY_PATTERNS)}
+LITERAL_TRIGGERS: dict[str, Category] = {}
+PHRASE_PATTERNS: list[tuple[Category, re.Pattern]] = []
+
+for _category, _patterns in CATEGORY_PATTERNS.items():
+    for _pattern in _patterns:
+        _match = _WORD_ALTERNATION.fullmatch(_pattern)
+        if _match:
+            for _word in _match.group(1).lower().split('|'):
+                LITERAL_TRIGGERS.setdefault(_word, _category)
+        else:
+            PHRASE_PATTERNS.append((_category, re.compile(_pattern, re.IGNORECASE)))
+
+
 def detect_confidence(text: str) -> tuple[Confidence, str]:
     """Detect confidence level from text patterns."""
     text_lower = text.lower()
@@ -129,12 +154,30 @@ def detect_category(text: str) -> Category:
     """Detect category from text content."""
     text_lower = text.lower()
 
-    for category, patterns in CATEGORY_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                return category
+    best = None
+    for token in _TOKEN_SPLIT.split(text_lower):
+        category = LITERAL_TRIGGERS.get(token)
+        if category is not None and (best is None or CATEGORY_RANK[category] < CATEGORY_RANK[best]):
+            best = category
+
+    # Only phrase patterns from higher-priority categories can still win
+    for category, pattern in PHRASE_PATTERNS:
+        if best is not None and CATEGORY_RANK[category] >= CATEGORY_RANK[best]:
+            break
+        if pattern.search(text_lower):
+            return category
+
+    return best or Category.UNKNOWN
 
-    return Category.UNKNOWN
+
+def _first_sentence_end(text: str) -> int:
+    """Return the index of the first '.', '!' or '?', or -1 if none."""
+    end = -1
+    for mark in ('.', '!', '?'):
+        i = text.find(mark)
+        if i != -1 and (end == -1 or i < end):
+            end = i
+    return end
 
 
 def extract_quote(text: str, max_length: int = 100) -> str:
@@ -147,9 +190,9 @@ def extract_quote(text: str, max_length: int = 100) -> str:
         return text
 
     # Try to find a sentence boundary
-    sentences = re.split(r'[.!?]', text)
-    if sentences and len(sentences[0]) <= max_length:
-        return sentences[0].strip() + "..."
+    end = _first_sentence_end(text)
+    if end != -1 and end <= max_length:
+        return text[:end].strip() + "..."
 
     # Truncate at word boundary
     truncated = text[:max_length].rsplit(' ', 1)[0]
@@ -249,23 +292,22 @@ def deduplicate_signals(signals: list[Signal]) -> list[Signal]:
     return unique
 
 
+SIGNALS_TABLE_HEADER = (
+    "| # | Signal | Confidence | Source Quote | Category |\n"
+    "|---|--------|------------|--------------|----------|\n"
+)
+
+
 def format_signals_table(signals: list[Signal]) -> str:
     """Format signals as a markdown table."""
     if not signals:
         return "No signals detected."
 
-    lines = [
-        "| # | Signal | Confidence | Source Quote | Category |",
-        "|---|--------|------------|--------------|----------|",
-    ]
-
-    for i, signal in enumerate(signals, 1):
-        lines.append(
-            f"| {i} | {signal.signal} | {signal.confidence.value} | "
-            f"\"{signal.source_quote}\" | {signal.category.value} |"
-        )
-
-    return '\n'.join(lines)
+    return SIGNALS_TABLE_HEADER + '\n'.join(
+        f"| {i} | {signal.signal} | {signal.confidence.value} | "
+        f"\"{signal.source_quote}\" | {signal.category.value} |"
+        for i, signal in enumerate(signals, 1)
+    )
 
 
 def run_tests():
@@ -363,7 +405,10 @@ def main():
             }
             for s in signals
         ]
-        print(json.dumps(output, indent=2))
+        if orjson is not None:
+            sys.stdout.buffer.write(orjson.dumps(output, option=orjson.OPT_INDENT_2) + b'\n')
+        else:
+            print(json.dumps(output, indent=2))
     else:
         print(format_signals_table(signals))
 
@@ -5,17 +5,21 @@ State Manager for Reflect Skill
 Manages state files for reflection tracking including:
 - reflect-state.yaml: Toggle state, pending reviews
 - reflect-metrics.yaml: Aggregate metrics
-- learnings.yaml: Log of applied learnings
+- learnings.jsonl: Append-only log of applied learnings (one JSON object per line)
 
 State directory is configurable via REFLECT_STATE_DIR env var.
 Defaults to ~/.reflect/ for portability or ~/.claude/session/ for Claude Code.
 """
 
+import functools
+import json
 import os
 import sys
+import uuid
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, Optional
 
 try:
     import yaml
@@ -23,9 +27,28 @@ except ImportError:
     print("PyYAML required. Install with: pip install pyyaml")
     sys.exit(1)
 
+# State is rewritten on every mutation, so use the libyaml-backed C loader and
+# dumper when PyYAML was built with them; fall back to the pure-Python ones.
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    # No libyaml: fall back silently, hooks import this on every run
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
+@functools.cache
 def get_state_dir() -> Path:
-    """Return state directory, configurable via env or default."""
+    """
+    Return state directory, configurable via env or default.
+
+    Resolved once per process. After changing REFLECT_STATE_DIR at runtime,
+    call cache_clear() on this and the get_*_file() helpers.
+    """
     custom_dir = os.environ.get('REFLECT_STATE_DIR')
     if custom_dir:
         return Path(custom_dir).expanduser()
@@ -46,34 +69,43 @@ def ensure_state_dir() -> Path:
     return state_dir
 
 
+@functools.cache
 def get_state_file() -> Path:
     """Return path to reflect-state.yaml."""
     return get_state_dir() / 'reflect-state.yaml'
 
 
+@functools.cache
 def get_metrics_file() -> Path:
     """Return path to reflect-metrics.yaml."""
     return get_state_dir() / 'reflect-metrics.yaml'
 
 
+@functools.cache
 def get_learnings_file() -> Path:
-    """Return path to learnings.yaml."""
+    """Return path to the legacy learnings.yaml (migrated to JSONL on first use)."""
     return get_state_dir() / 'learnings.yaml'
 
 
+@functools.cache
+def get_learnings_jsonl() -> Path:
+    """Return path to learnings.jsonl."""
+    return get_state_dir() / 'learnings.jsonl'
+
+
 def load_yaml(path: Path) -> dict:
     """Load YAML file, return empty dict if not found."""
     if not path.exists():
         return {}
     with open(path, 'r') as f:
-        return yaml.safe_load(f) or {}
+        return yaml.load(f, Loader=_Loader) or {}
 
 
 def save_yaml(path: Path, data: dict) -> None:
     """Save data to YAML file."""
     ensure_state_dir()
     with open(path, 'w') as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(data, f, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
 
 
 def init_state() -> dict:
@@ -89,7 +121,7 @@ def init_state() -> dict:
     default_state = {
         'auto_reflect': False,
         'last_reflection': None,
-        'pending_low_confidence': []
+        'pending_low_confidence': {}
     }
     save_yaml(state_file, default_state)
     print(f"Initialized new state at {state_file}")
@@ -101,64 +133,139 @@ def get_state() -> dict:
     return load_yaml(get_state_file())
 
 
-def set_auto_reflect(enabled: bool) -> None:
+class StateSession:
+    """
+    Load state once, apply mutations in memory, write once on exit.
+
+    Mutations within a session share one timestamp (``now``), taken on entry.
+
+    Usage:
+        with StateSession() as session:
+            for signal in signals:
+                add_pending_low_confidence(signal, session=session)
+    """
+
+    def __init__(self):
+        self.path = get_state_file()
+        self.state: dict = {}
+        self.dirty = False
+        self.now = ''
+
+    def __enter__(self) -> 'StateSession':
+        self.state = load_yaml(self.path)
+        self.dirty = _migrate_pending(self.state)
+        self.now = datetime.now().isoformat()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self.dirty and exc_type is None:
+            save_yaml(self.path, self.state)
+        return False
+
+
+def _migrate_pending(state: dict) -> bool:
+    """Convert a legacy pending-review list into an id-keyed dict."""
+    pending = state.get('pending_low_confidence')
+    if not isinstance(pending, list):
+        return False
+    migrated = {}
+    for item in pending:
+        review_id = uuid.uuid4().hex
+        migrated[review_id] = {'id': review_id, **item}
+    state['pending_low_confidence'] = migrated
+    return True
+
+
+def _session(session: Optional[StateSession]):
+    """Reuse the caller's session, or open a single-write one."""
+    return nullcontext(session) if session is not None else StateSession()
+
+
+def set_auto_reflect(enabled: bool, session: Optional[StateSession] = None) -> None:
     """Enable or disable auto-reflection."""
-    state = get_state()
-    state['auto_reflect'] = enabled
-    save_yaml(get_state_file(), state)
+    with _session(session) as s:
+        s.state['auto_reflect'] = enabled
+        s.dirty = True
     status = "enabled" if enabled else "disabled"
     print(f"Auto-reflection {status}")
 
 
-def update_last_reflection() -> None:
+def update_last_reflection(session: Optional[StateSession] = None) -> None:
     """Update last_reflection timestamp."""
-    state = get_state()
-    state['last_reflection'] = datetime.now().isoformat()
-    save_yaml(get_state_file(), state)
+    with _session(session) as s:
+        s.state['last_reflection'] = s.now
+        s.dirty = True
 
 
-def add_pending_low_confidence(signal: dict) -> None:
+def add_pending_low_confidence(signal: dict, session: Optional[StateSession] = None) -> None:
     """Add signal to pending review queue."""
-    state = get_state()
-    pending = state.get('pending_low_confidence', [])
-    pending.append({
-        'signal': signal.get('signal', ''),
-        'detected': datetime.now().isoformat(),
-        'awaiting_validation': True,
-        'source_quote': signal.get('source_quote', ''),
-        'category': signal.get('category', 'Unknown')
-    })
-    state['pending_low_confidence'] = pending
-    save_yaml(get_state_file(), state)
-
-
-def get_pending_reviews() -> list:
+    with _session(session) as s:
+        pending = s.state.get('pending_low_confidence') or {}
+        review_id = uuid.uuid4().hex
+        pending[review_id] = {
+            'id': review_id,
+            'signal': signal.get('signal', ''),
+            'detected': s.now,
+            'awaiting_validation': True,
+            'source_quote': signal.get('source_quote', ''),
+            'category': signal.get('category', 'Unknown')
+        }
+        s.state['pending_low_confidence'] = pending
+        s.dirty = True
+
+
+def get_pending_reviews(session: Optional[StateSession] = None) -> list:
     """Get all pending low-confidence learnings."""
-    state = get_state()
-    return state.get('pending_low_confidence', [])
-
-
-def clear_pending_review(index: int) -> bool:
-    """Remove a pending review by index."""
-    state = get_state()
-    pending = state.get('pending_low_confidence', [])
-    if 0 <= index < len(pending):
-        pending.pop(index)
-        state['pending_low_confidence'] = pending
-        save_yaml(get_state_file(), state)
-        return True
+    with _session(session) as s:
+        return list((s.state.get('pending_low_confidence') or {}).values())
+
+
+def clear_pending_review(review_id: str, session: Optional[StateSession] = None) -> bool:
+    """Remove a pending review by id."""
+    with _session(session) as s:
+        pending = s.state.get('pending_low_confidence') or {}
+        if pending.pop(review_id, None) is not None:
+            s.dirty = True
+            return True
     return False
 
 
-def add_learning(learning: dict) -> None:
-    """Add a learning to the learnings log."""
-    learnings_file = get_learnings_file()
-    learnings = load_yaml(learnings_file)
+def _json_line(entry: dict) -> bytes:
+    """Serialize one learnings entry as a newline-terminated JSON line."""
+    if orjson is not None:
+        return orjson.dumps(entry) + b'\n'
+    return (json.dumps(entry, separators=(',', ':'), default=str) + '\n').encode('utf-8')
+
 
-    if 'entries' not in learnings:
-        learnings['entries'] = []
+def _append_line(path: Path, line: bytes) -> None:
+    """Append a line with a single O_APPEND write."""
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
 
-    learnings['entries'].append({
+
+def migrate_learnings() -> None:
+    """Convert a legacy learnings.yaml into learnings.jsonl, once."""
+    legacy = get_learnings_file()
+    jsonl = get_learnings_jsonl()
+    if not legacy.exists() or jsonl.exists():
+        return
+
+    entries = load_yaml(legacy).get('entries') or []
+    with open(jsonl, 'wb') as f:
+        for entry in entries:
+            f.write(_json_line(entry))
+    legacy.rename(legacy.with_name(legacy.name + '.migrated'))
+
+
+def add_learning(learning: dict) -> None:
+    """Append a learning to the learnings log."""
+    ensure_state_dir()
+    migrate_learnings()
+
+    _append_line(get_learnings_jsonl(), _json_line({
         'timestamp': datetime.now().isoformat(),
         'signal': learning.get('signal', ''),
         'confidence': learning.get('confidence', 'unknown'),
@@ -166,14 +273,27 @@ def add_learning(learning: dict) -> None:
         'target': learning.get('target', ''),
         'status': learning.get('status', 'applied'),
         'session_id': learning.get('session_id', '')
-    })
+    }))
+
 
-    save_yaml(learnings_file, learnings)
+def iter_learnings() -> Iterator[dict]:
+    """Yield logged learnings lazily, oldest first."""
+    migrate_learnings()
+    loads = orjson.loads if orjson is not None else json.loads
+    try:
+        f = open(get_learnings_jsonl(), 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
 
 
-def show_status() -> None:
+def show_status(session: Optional[StateSession] = None) -> None:
     """Print current state and metrics."""
-    state = get_state()
+    with _session(session) as s:
+        state = s.state
     metrics = load_yaml(get_metrics_file())
 
     print("\n=== Reflect Status ===\n")
@@ -181,7 +301,7 @@ def show_status() -> None:
     print(f"Auto-Reflect: {'Enabled' if state.get('auto_reflect') else 'Disabled'}")
     print(f"Last Reflection: {state.get('last_reflection', 'Never')}")
 
-    pending = state.get('pending_low_confidence', [])
+    pending = state.get('pending_low_confidence') or {}
     print(f"Pending Reviews: {len(pending)}")
 
     if metrics:
@@ -205,23 +325,28 @@ def main():
 
     if args.command == 'init':
         init_state()
-    elif args.command == 'status':
-        show_status()
-    elif args.command == 'on':
-        set_auto_reflect(True)
-    elif args.command == 'off':
-        set_auto_reflect(False)
-    elif args.command == 'pending':
-        pending = get_pending_reviews()
-        if not pending:
-            print("No pending low-confidence learnings.")
-        else:
-            print(f"\n=== Pending Reviews ({len(pending)}) ===\n")
-            for i, item in enumerate(pending):
-                print(f"{i+1}. {item.get('signal')}")
-                print(f"   Detected: {item.get('detected')}")
-                print(f"   Quote: \"{item.get('source_quote', 'N/A')}\"")
-                print()
+        return
+
+    # One load and at most one write per invocation
+    with StateSession() as session:
+        if args.command == 'status':
+            show_status(session)
+        elif args.command == 'on':
+            set_auto_reflect(True, session)
+        elif args.command == 'off':
+            set_auto_reflect(False, session)
+        elif args.command == 'pending':
+            pending = get_pending_reviews(session)
+            if not pending:
+                print("No pending low-confidence learnings.")
+            else:
+                print(f"\n=== Pending Reviews ({len(pending)}) ===\n")
+                for i, item in enumerate(pending):
+                    print(f"{i+1}. {item.get('signal')}")
+                    print(f"   ID: {item.get('id')}")
+                    print(f"   Detected: {item.get('detected')}")
+                    print(f"   Quote: \"{item.get('source_quote', 'N/A')}\"")
+                    print()
 
 
 if __name__ == '__main__':
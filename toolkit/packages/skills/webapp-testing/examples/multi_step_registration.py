@@ -7,302 +7,597 @@ Demonstrates complete registration flow using all webapp-testing utilities:
 - Smart form filling (handles field variations)
 - Database operations (invite codes, email verification)
 - Advanced wait strategies
+- Batch runs (one browser per worker, one context per user)
 
 This example is based on a real-world React/Supabase app with 3-step registration.
 """
 
+import argparse
+import atexit
+import hashlib
+import json
+import re
 import sys
 import os
-from playwright.sync_api import sync_playwright
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from playwright.sync_api import sync_playwright, expect, Browser, BrowserContext, Page
 import time
 
-# Add utils to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Make utils/ importable when run as a script. The skill directory name
+# contains a hyphen, so it can't be imported as a package with relative imports.
+_SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SKILL_DIR not in sys.path:
+    sys.path.insert(0, _SKILL_DIR)
 
+from utils.browser_config import BrowserConfig, ensure_browsers_installed
 from utils.ui_interactions import dismiss_cookie_banner, dismiss_modal
-from utils.form_helpers import SmartFormFiller, handle_multi_step_form
+from utils.form_helpers import SmartFormFiller
 from utils.supabase import SupabaseTestClient
-from utils.wait_strategies import combined_wait, smart_navigation_wait
 
 
-def register_user_complete_flow():
+# Configuration - adjust for your app
+DEFAULT_CONFIG = {
+    'app_url': "http://localhost:3000",
+
+    # Database config (adjust for your project)
+    'db_password': "your-db-password",
+    'supabase_url': "https://project.supabase.co",
+    'service_key': "your-service-role-key",
+
+    # Test user data
+    'email': "test.user@example.com",
+    'password': "TestPass123!",
+    'full_name': "Test User",
+    'phone': "+447700900123",
+    'date_of_birth': "1990-01-15",
+    'invite_code': "TEST2024",
+
+    # Diagnostics (TRACE=1 / SCREENSHOT=1) are written to <prefix>_trace.zip etc.
+    'screenshot_prefix': "/tmp/reg",
+}
+
+# Where the app lands after COMPLETE (/login when it wants a fresh sign-in)
+POST_REGISTER_URL = re.compile(r'(dashboard|perform|welcome|login)')
+
+# Display names for step fields
+FIELD_LABELS = {
+    'email': 'Email',
+    'password': 'Password',
+    'full_name': 'Full Name',
+    'date_of_birth': 'Date of Birth',
+    'phone': 'Phone',
+}
+
+# Diagnostics cost real time, so happy-path runs skip them unless asked.
+# TRACE=1 records a Playwright trace (every action, DOM snapshot and network
+# call) to <prefix>_trace.zip; SCREENSHOT=1 keeps final/error screenshots.
+TRACE = os.environ.get('TRACE') == '1'
+SCREENSHOTS = os.environ.get('SCREENSHOT') == '1'
+_screenshot_writer = ThreadPoolExecutor(max_workers=2)
+
+# Shared driver/browser for single runs in this process (see get_browser)
+_PLAYWRIGHT = None
+_BROWSER = None
+
+
+def get_browser(headless: bool = True) -> Browser:
     """
-    Complete multi-step registration with database setup and verification.
+    Return a shared Chromium instance, launching it on first use.
 
-    Flow:
-    1. Create invite code in database
-    2. Navigate to registration page
-    3. Fill multi-step form (Code → Credentials → Personal Info → Avatar)
-    4. Verify email via database
-    5. Login
-    6. Verify dashboard access
-    7. Cleanup (optional)
+    The browser is closed at interpreter exit, so repeated flows in one
+    process pay the launch cost once. Playwright's sync API is bound to the
+    thread that started it; batch workers launch their own (see run_batch).
+
+    Args:
+        headless: Launch mode, only honoured on the first call
     """
+    global _PLAYWRIGHT, _BROWSER
 
-    # Configuration - adjust for your app
-    APP_URL = "http://localhost:3000"
-    REGISTER_URL = f"{APP_URL}/register"
+    if _BROWSER is None:
+        ensure_browsers_installed()
+        _PLAYWRIGHT = sync_playwright().start()
+        _BROWSER = BrowserConfig.launch_test_browser(_PLAYWRIGHT, headless=headless)
+        atexit.register(_close_browser)
 
-    # Database config (adjust for your project)
-    DB_PASSWORD = "your-db-password"
-    SUPABASE_URL = "https://project.supabase.co"
-    SERVICE_KEY = "your-service-role-key"
+    return _BROWSER
 
-    # Test user data
-    TEST_EMAIL = "test.user@example.com"
-    TEST_PASSWORD = "TestPass123!"
-    FULL_NAME = "Test User"
-    PHONE = "+447700900123"
-    DATE_OF_BIRTH = "1990-01-15"
-    INVITE_CODE = "TEST2024"
 
-    print("\n" + "="*60)
-    print("MULTI-STEP REGISTRATION AUTOMATION")
-    print("="*60)
+def _close_browser():
+    global _PLAYWRIGHT, _BROWSER
 
-    # Step 1: Setup database
-    print("\n[1/8] Setting up database...")
-    db_client = SupabaseTestClient(
-        url=SUPABASE_URL,
-        service_key=SERVICE_KEY,
-        db_password=DB_PASSWORD
-    )
+    if _BROWSER is not None:
+        _BROWSER.close()
+        _PLAYWRIGHT.stop()
+        _PLAYWRIGHT = _BROWSER = None
 
-    # Create invite code
-    if db_client.create_invite_code(INVITE_CODE, code_type="general"):
-        print(f"    ✓ Created invite code: {INVITE_CODE}")
-    else:
-        print(f"    ⚠️  Invite code may already exist")
 
-    # Clean up any existing test user
-    existing_user = db_client.find_user_by_email(TEST_EMAIL)
-    if existing_user:
-        print(f"    Cleaning up existing user...")
-        db_client.cleanup_related_records(existing_user)
-        db_client.delete_user(existing_user)
+def confirm(env_var: str, prompt: str) -> bool:
+    """
+    Resolve a yes/no choice without blocking unattended runs.
 
-    # Step 2: Start browser automation
-    print("\n[2/8] Starting browser automation...")
+    Uses env_var when set ('1' means yes), prompts only when stdin is a
+    terminal, and otherwise defaults to yes.
+    """
+    value = os.environ.get(env_var)
+    if value is not None:
+        return value == '1'
+    if sys.stdin.isatty():
+        return input(prompt).strip().lower() == 'y'
+    return True
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page(viewport={'width': 1400, 'height': 1000})
 
-        try:
-            # Step 3: Navigate to registration
-            print("\n[3/8] Navigating to registration page...")
-            page.goto(REGISTER_URL, wait_until='networkidle')
-            smart_navigation_wait(page)  # Use smart wait instead of time.sleep(2)
-
-            # Handle cookie banner
-            if dismiss_cookie_banner(page):
-                print("    ✓ Dismissed cookie banner")
-
-            page.screenshot(path='/tmp/reg_step1_start.png', full_page=True)
-            print("    ✓ Screenshot: /tmp/reg_step1_start.png")
-
-            # Step 4: Fill multi-step form
-            print("\n[4/8] Filling multi-step registration form...")
-
-            # Define form steps
-            steps = [
-                {
-                    'name': 'Invite Code',
-                    'fields': {'invite_code': INVITE_CODE},
-                    'custom_fill': lambda: page.locator('input').first.fill(INVITE_CODE),
-                    'custom_submit': lambda: page.locator('input').first.press('Enter'),
-                },
-                {
-                    'name': 'Credentials',
-                    'fields': {
-                        'email': TEST_EMAIL,
-                        'password': TEST_PASSWORD,
-                    },
-                    'checkbox': True,  # Terms of service
-                },
-                {
-                    'name': 'Personal Info',
-                    'fields': {
-                        'full_name': FULL_NAME,
-                        'date_of_birth': DATE_OF_BIRTH,
-                        'phone': PHONE,
-                    },
-                },
-                {
-                    'name': 'Avatar Selection',
-                    'complete': True,  # Final step with COMPLETE button
-                }
-            ]
-
-            # Process each step
-            filler = SmartFormFiller()
-
-            for i, step in enumerate(steps):
-                print(f"\n    Step {i+1}/4: {step['name']}")
-
-                # Custom filling logic for first step (invite code)
-                if 'custom_fill' in step:
-                    step['custom_fill']()
-                    combined_wait(page, timeout=2000)  # Brief wait for UI update
-
-                    if 'custom_submit' in step:
-                        step['custom_submit']()
-                    else:
-                        page.locator('button:has-text("CONTINUE")').first.click()
-
-                    # Wait for navigation/API response
-                    combined_wait(page, timeout=5000)
-                    smart_navigation_wait(page)
-
-                # Standard form filling for other steps
-                elif 'fields' in step:
-                    if 'email' in step['fields']:
-                        filler.fill_email_field(page, step['fields']['email'])
-                        print("      ✓ Email")
-
-                    if 'password' in step['fields']:
-                        filler.fill_password_fields(page, step['fields']['password'])
-                        print("      ✓ Password")
-
-                    if 'full_name' in step['fields']:
-                        filler.fill_name_field(page, step['fields']['full_name'])
-                        print("      ✓ Full Name")
-
-                    if 'date_of_birth' in step['fields']:
-                        filler.fill_date_field(page, step['fields']['date_of_birth'], field_hint='birth')
-                        print("      ✓ Date of Birth")
-
-                    if 'phone' in step['fields']:
-                        filler.fill_phone_field(page, step['fields']['phone'])
-                        print("      ✓ Phone")
-
-                    # Check terms checkbox if needed
-                    if step.get('checkbox'):
-                        page.locator('input[type="checkbox"]').first.check()
-                        print("      ✓ Terms accepted")
-
-                    combined_wait(page, timeout=1000)  # Brief wait for form validation
-
-                    # Click continue
-                    page.locator('button:has-text("CONTINUE")').first.click()
-                    combined_wait(page, timeout=5000)  # Wait for step transition
-                    smart_navigation_wait(page)
-
-                # Final step - click COMPLETE
-                elif step.get('complete'):
-                    complete_btn = page.locator('button:has-text("COMPLETE")').first
-                    complete_btn.click()
-                    print("      ✓ Clicked COMPLETE")
+def save_screenshot(page, path: str, full_page: bool = False) -> bool:
+    """
+    Capture a JPEG screenshot when SCREENSHOT=1 and write it off-thread.
+
+    The capture itself must stay on the page's thread; only the file
+    write is handed to the writer pool.
+
+    Returns:
+        True if a screenshot was taken
+    """
+    if not SCREENSHOTS:
+        return False
+
+    data = page.screenshot(type='jpeg', quality=60, full_page=full_page)
+    _screenshot_writer.submit(Path(path).write_bytes, data)
+    return True
+
+
+# Saved storage states hold live session cookies and tokens, so they live in a
+# private per-user directory rather than a predictable path under /tmp
+AUTH_STATE_DIR = Path.home() / '.cache' / 'webapp-testing' / 'auth'
+
+
+def auth_state_path(email: str) -> str:
+    """Where the logged-in storage state for this user is cached."""
+    digest = hashlib.sha256(email.lower().encode()).hexdigest()[:16]
+    return str(AUTH_STATE_DIR / f"auth_state_{digest}.json")
+
+
+def save_auth_state(context: BrowserContext, email: str) -> str:
+    """
+    Save the context's storage state for email, readable only by this user.
+
+    Returns:
+        Path the state was written to
+    """
+    AUTH_STATE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    os.chmod(AUTH_STATE_DIR, 0o700)
+
+    path = auth_state_path(email)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_NOFOLLOW', 0), 0o600)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(context.storage_state(), f)
+    return path
+
+
+def login(page: Page, config: Dict[str, Any]):
+    """Log in through the form on the current /login page."""
+    SmartFormFiller.fill_email_field(page, config['email'])
+    SmartFormFiller.fill_password_fields(page, config['password'], confirm=False)
+
+    page.locator('button[type="submit"]').first.click()
+    page.wait_for_url(lambda url: 'login' not in url.lower(), timeout=10000)
+
+
+def context_has_valid_session(page: Page, app_url: str) -> bool:
+    """Probe the dashboard; a valid session is not bounced to /login."""
+    page.goto(f"{app_url}/perform", wait_until='domcontentloaded')
+    return 'login' not in page.url.lower()
+
+
+def open_logged_in_page(browser: Browser, config: Dict[str, Any]) -> Page:
+    """
+    Open a page logged in as config['email'] for follow-up scenarios.
 
-                    # Wait for registration to complete (may involve API calls)
-                    combined_wait(page, timeout=10000)
-                    smart_navigation_wait(page)
+    Reuses the storage state saved by run_registration() so no login form is
+    needed; falls back to logging in (and refreshing the saved state) when
+    there is none or it has expired.
+    """
+    config = {**DEFAULT_CONFIG, **config}
+    state = auth_state_path(config['email'])
+
+    context = BrowserConfig.create_test_context(
+        browser,
+        config['app_url'],
+        storage_state=state if os.path.exists(state) else None,
+        verbose=False
+    )
+    page = context.new_page()
+
+    if not context_has_valid_session(page, config['app_url']):
+        login(page, config)
+        save_auth_state(context, config['email'])
+
+    return page
 
-                # Screenshot after each step
-                page.screenshot(path=f'/tmp/reg_step{i+1}_complete.png', full_page=True)
-                print(f"      ✓ Screenshot: /tmp/reg_step{i+1}_complete.png")
 
-            print("\n    ✓ Multi-step form completed!")
+def setup_database(config: Dict[str, Any]) -> SupabaseTestClient:
+    """Create the invite code and remove any leftover user with the test email."""
+    db_client = SupabaseTestClient(
+        url=config['supabase_url'],
+        service_key=config['service_key'],
+        db_password=config['db_password']
+    )
 
-            # Step 5: Handle post-registration
-            print("\n[5/8] Handling post-registration...")
+    # Create invite code and clean up any existing test user in one round-trip
+    if db_client.setup_test_user(config['email'], config['invite_code'], code_type="general"):
+        print(f"    ✓ Created invite code: {config['invite_code']}")
+        print(f"    ✓ Removed any existing {config['email']}")
+    else:
+        print(f"    ⚠️  Database setup failed")
 
-            # Dismiss welcome modal if present
-            if dismiss_modal(page, modal_identifier="Welcome"):
-                print("    ✓ Dismissed welcome modal")
+    return db_client
 
-            current_url = page.url
-            print(f"    Current URL: {current_url}")
 
-            # Step 6: Verify email via database
-            print("\n[6/8] Verifying email via database...")
-            combined_wait(page, timeout=2000)  # Brief wait for user to be created in DB
+def run_registration(
+    context: BrowserContext,
+    config: Dict[str, Any],
+    db_client: SupabaseTestClient
+) -> Optional[str]:
+    """
+    Drive the registration UI in a fresh page of the given context.
 
-            user_id = db_client.find_user_by_email(TEST_EMAIL)
-            if user_id:
-                print(f"    ✓ Found user: {user_id}")
+    Args:
+        context: Browser context to open the page in
+        config: Configuration dict (see DEFAULT_CONFIG)
+        db_client: Client used to verify the new user's email
 
-                if db_client.confirm_email(user_id):
-                    print("    ✓ Email verified in database")
+    Returns:
+        The new user's id, or None if it was not found in the database
+    """
+    app_url = config['app_url']
+    shots = config['screenshot_prefix']
+    page = context.new_page()
+    user_id = None
+
+    try:
+        # Step 3: Navigate to registration
+        print("\n[3/8] Navigating to registration page...")
+        page.goto(f"{app_url}/register", wait_until='domcontentloaded')
+        page.wait_for_selector('input', state='visible')
+
+        # Handle cookie banner
+        if dismiss_cookie_banner(page):
+            print("    ✓ Dismissed cookie banner")
+
+        # Step 4: Fill multi-step form
+        print("\n[4/8] Filling multi-step registration form...")
+
+        # Locators are lazy, so build them once and reuse them across steps.
+        # Role queries match the accessible name case-insensitively.
+        first_input = page.locator('input').first
+        continue_btn = page.get_by_role('button', name='CONTINUE').first
+        complete_btn = page.get_by_role('button', name='COMPLETE').first
+
+        # Define form steps
+        steps = [
+            {
+                'name': 'Invite Code',
+                'fields': {'invite_code': config['invite_code']},
+                'custom_fill': lambda: first_input.fill(config['invite_code']),
+                'custom_submit': lambda: first_input.press('Enter'),
+                'next_anchor': page.locator('input[type="email"]').first,
+            },
+            {
+                'name': 'Credentials',
+                'fields': {
+                    'email': config['email'],
+                    'password': config['password'],
+                },
+                'checkbox': True,  # Terms of service
+                'next_anchor': page.locator('input[name*="name"]').first,
+            },
+            {
+                'name': 'Personal Info',
+                'fields': {
+                    'full_name': config['full_name'],
+                    'date_of_birth': config['date_of_birth'],
+                    'phone': config['phone'],
+                },
+                'next_anchor': complete_btn,
+            },
+            {
+                'name': 'Avatar Selection',
+                'complete': True,  # Final step with COMPLETE button
+            }
+        ]
+
+        # Process each step
+        for i, step in enumerate(steps):
+            print(f"\n    Step {i+1}/4: {step['name']}")
+
+            # Custom filling logic for first step (invite code)
+            if 'custom_fill' in step:
+                step['custom_fill']()
+
+                if 'custom_submit' in step:
+                    step['custom_submit']()
                 else:
-                    print("    ⚠️  Could not verify email")
-            else:
-                print("    ⚠️  User not found in database")
+                    continue_btn.click()
+
+                # Wait for the next step to render instead of network idle
+                expect(step['next_anchor']).to_be_visible(timeout=10000)
+
+            # Standard form filling for other steps
+            elif 'fields' in step:
+                # One round-trip for every field on the step
+                results = SmartFormFiller.fill_step_bulk(page, step['fields'])
+                for key, ok in results.items():
+                    label = FIELD_LABELS.get(key, key)
+                    print(f"      ✓ {label}" if ok else f"      ⚠️  {label} not found")
+
+                # Check terms checkbox if needed
+                if step.get('checkbox'):
+                    page.locator('input[type="checkbox"]').first.check()
+                    print("      ✓ Terms accepted")
+
+                # Click continue (auto-waits until the button is enabled)
+                continue_btn.click()
+                expect(step['next_anchor']).to_be_visible(timeout=10000)
+
+            # Final step - click COMPLETE
+            elif step.get('complete'):
+                # Resume as soon as the post-registration page is parsed
+                with page.expect_navigation(
+                    url=POST_REGISTER_URL,
+                    wait_until='domcontentloaded',
+                    timeout=15000
+                ):
+                    complete_btn.click()
+                print("      ✓ Clicked COMPLETE")
+
+        print("\n    ✓ Multi-step form completed!")
 
-            # Step 7: Login (if not already logged in)
-            print("\n[7/8] Logging in...")
+        # Step 5: Handle post-registration
+        print("\n[5/8] Handling post-registration...")
 
-            if 'login' in current_url.lower():
-                print("    Needs login...")
+        # Dismiss welcome modal if present
+        if dismiss_modal(page, modal_identifier="Welcome"):
+            print("    ✓ Dismissed welcome modal")
 
-                filler.fill_email_field(page, TEST_EMAIL)
-                filler.fill_password_fields(page, TEST_PASSWORD, confirm=False)
-                combined_wait(page, timeout=1000)
+        current_url = page.url
+        print(f"    Current URL: {current_url}")
 
-                page.locator('button[type="submit"]').first.click()
-                combined_wait(page, timeout=8000)  # Wait for login API
-                smart_navigation_wait(page)
+        # Step 6: Verify email via database
+        print("\n[6/8] Verifying email via database...")
+        # Poll until the user row exists rather than sleeping a fixed time
+        user_id = db_client.wait_for_user_by_email(config['email'], timeout_s=10)
+        if user_id:
+            print(f"    ✓ Found user: {user_id}")
 
-                print("    ✓ Logged in")
+            if db_client.confirm_email(user_id):
+                print("    ✓ Email verified in database")
             else:
-                print("    ✓ Already logged in")
+                print("    ⚠️  Could not verify email")
+        else:
+            print("    ⚠️  User not found in database")
+
+        # Step 7: Login (if not already logged in)
+        print("\n[7/8] Logging in...")
+
+        if 'login' in current_url.lower():
+            print("    Needs login...")
+            login(page, config)
+            print("    ✓ Logged in")
+        else:
+            print("    ✓ Already logged in")
+
+        # Step 8: Verify dashboard access
+        print("\n[8/8] Verifying dashboard access...")
+
+        if save_screenshot(page, f'{shots}_final_dashboard.jpg', full_page=True):
+            print(f"    ✓ Screenshot: {shots}_final_dashboard.jpg")
+
+        # Check if we're on the dashboard
+        if 'perform' in page.url.lower() or 'dashboard' in page.url.lower():
+            print("    ✓ Successfully reached dashboard!")
+
+            # Save cookies + localStorage so follow-up runs skip the login
+            state = save_auth_state(context, config['email'])
+            print(f"    ✓ Session saved: {state}")
+        else:
+            print(f"    ⚠️  Unexpected URL: {page.url}")
+
+        return user_id
+
+    except Exception:
+        if save_screenshot(page, f'{shots}_error.jpg', full_page=True):
+            print(f"    Error screenshot: {shots}_error.jpg")
+        raise
+
+
+def register_user_complete_flow(
+    config: Optional[Dict[str, Any]] = None,
+    inspect: bool = False,
+    headless: bool = True,
+    cleanup: Optional[bool] = None
+):
+    """
+    Complete multi-step registration with database setup and verification.
 
-            # Step 8: Verify dashboard access
-            print("\n[8/8] Verifying dashboard access...")
+    Flow:
+    1. Create invite code in database
+    2. Navigate to registration page
+    3. Fill multi-step form (Code → Credentials → Personal Info → Avatar)
+    4. Verify email via database
+    5. Login
+    6. Verify dashboard access
+    7. Cleanup (optional)
 
-            # Navigate to dashboard/perform if not already there
-            if 'perform' not in page.url.lower() and 'dashboard' not in page.url.lower():
-                page.goto(f"{APP_URL}/perform", wait_until='networkidle')
-                smart_navigation_wait(page)
+    Args:
+        config: Overrides for DEFAULT_CONFIG
+        inspect: Keep the browser open for 30 seconds after success
+        headless: Run the shared browser without a window
+        cleanup: Delete the test user afterwards (None = CLEANUP_TEST_USER
+            env var, else prompt on a terminal, else yes)
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
 
-            page.screenshot(path='/tmp/reg_final_dashboard.png', full_page=True)
-            print("    ✓ Screenshot: /tmp/reg_final_dashboard.png")
+    print("\n" + "="*60)
+    print("MULTI-STEP REGISTRATION AUTOMATION")
+    print("="*60)
 
-            # Check if we're on the dashboard
-            if 'perform' in page.url.lower() or 'dashboard' in page.url.lower():
-                print("    ✓ Successfully reached dashboard!")
-            else:
-                print(f"    ⚠️  Unexpected URL: {page.url}")
+    # Step 1: Setup database
+    print("\n[1/8] Setting up database...")
+    db_client = setup_database(config)
+
+    # Step 2: Start browser automation
+    print("\n[2/8] Starting browser automation...")
+
+    user_id = None
+
+    def cleanup_user():
+        # Optional cleanup
+        print("\n" + "="*60)
+        print("Cleanup")
+        print("="*60)
+
+        delete = cleanup
+        if delete is None:
+            delete = confirm('CLEANUP_TEST_USER', "\nDelete test user? (y/N): ")
+
+        if delete and user_id:
+            print("Cleaning up...")
+            db_client.teardown_test_user(user_id)
+            print("✓ Test user deleted")
+        else:
+            print("Test user kept for manual testing")
+
+    # Exit callbacks run in reverse: save the trace, close the context,
+    # then clean up the user
+    with ExitStack() as stack:
+        stack.callback(cleanup_user)
+
+        context = BrowserConfig.create_test_context(
+            get_browser(headless=headless),
+            config['app_url'],
+            viewport={'width': 1400, 'height': 1000},
+            trace=TRACE
+        )
+        stack.callback(context.close)
+        if TRACE:
+            stack.callback(BrowserConfig.save_trace, context, f"{config['screenshot_prefix']}_trace.zip")
+
+        try:
+            user_id = run_registration(context, config, db_client)
 
             print("\n" + "="*60)
             print("REGISTRATION COMPLETE!")
             print("="*60)
-            print(f"\nUser: {TEST_EMAIL}")
-            print(f"Password: {TEST_PASSWORD}")
+            print(f"\nUser: {config['email']}")
+            print(f"Password: {config['password']}")
             print(f"User ID: {user_id}")
-            print(f"\nScreenshots saved to /tmp/reg_step*.png")
+            if TRACE:
+                print(f"\nTrace: playwright show-trace {config['screenshot_prefix']}_trace.zip")
             print("="*60)
 
             # Keep browser open for inspection
-            print("\nKeeping browser open for 30 seconds...")
-            time.sleep(30)
+            if inspect:
+                print("\nKeeping browser open for 30 seconds...")
+                time.sleep(30)
 
         except Exception as e:
             print(f"\n❌ Error: {e}")
             import traceback
             traceback.print_exc()
-            page.screenshot(path='/tmp/reg_error.png', full_page=True)
-            print("    Error screenshot: /tmp/reg_error.png")
 
+
+def _run_worker(configs: List[Dict[str, Any]]) -> List[tuple]:
+    """Register each config in its own context of one headless browser."""
+    results = []
+
+    with sync_playwright() as p:
+        browser = BrowserConfig.launch_test_browser(p)
+        try:
+            for config in configs:
+                user_id = None
+                try:
+                    db_client = setup_database(config)
+                    context = BrowserConfig.create_test_context(
+                        browser,
+                        config['app_url'],
+                        trace=TRACE,
+                        block_assets=not (TRACE or SCREENSHOTS),
+                        verbose=False
+                    )
+                    try:
+                        user_id = run_registration(context, config, db_client)
+                    finally:
+                        if TRACE:
+                            BrowserConfig.save_trace(context, f"{config['screenshot_prefix']}_trace.zip")
+                        context.close()
+                except Exception as e:
+                    print(f"\n❌ Error ({config['email']}): {e}")
+                results.append((config['email'], user_id))
         finally:
             browser.close()
 
-            # Optional cleanup
-            print("\n" + "="*60)
-            print("Cleanup")
-            print("="*60)
+    return results
 
-            cleanup = input("\nDelete test user? (y/N): ").strip().lower()
-            if cleanup == 'y' and user_id:
-                print("Cleaning up...")
-                db_client.cleanup_related_records(user_id)
-                db_client.delete_user(user_id)
-                print("✓ Test user deleted")
-            else:
-                print("Test user kept for manual testing")
+
+def run_batch(configs: List[Dict[str, Any]], workers: int = 4) -> Dict[str, Optional[str]]:
+    """
+    Register several users in parallel.
+
+    Each worker thread starts one Playwright driver and one headless browser,
+    then gives every registration its own BrowserContext. Playwright's sync
+    API objects belong to the thread that created them, so workers do not
+    share a browser.
+
+    Args:
+        configs: Per-user overrides for DEFAULT_CONFIG (at least 'email')
+        workers: Number of worker threads/browsers
+
+    Returns:
+        Mapping of email -> user id (None if registration failed)
+
+    Example:
+        run_batch([
+            {'email': 'a@example.com', 'invite_code': 'TESTA'},
+            {'email': 'b@example.com', 'invite_code': 'TESTB'},
+        ], workers=2)
+    """
+    if not configs:
+        return {}
+
+    configs = [
+        {**DEFAULT_CONFIG, 'screenshot_prefix': f"/tmp/reg{i}", **config}
+        for i, config in enumerate(configs)
+    ]
+    workers = max(1, min(workers, len(configs)))
+
+    # Install once up front rather than racing from every worker
+    ensure_browsers_installed()
+    shards = [configs[i::workers] for i in range(workers)]
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for shard_results in pool.map(_run_worker, shards):
+            results.update(shard_results)
+
+    return results
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Multi-step registration example')
+    parser.add_argument('--inspect', action='store_true',
+                        help='Keep the browser open for 30 seconds after registration')
+    parser.add_argument('--headed', action='store_true',
+                        help='Show the browser window instead of running headless')
+    parser.add_argument('--yes', action='store_true',
+                        help='Skip the confirmation prompt (or set CONFIRM=1)')
+    cleanup_group = parser.add_mutually_exclusive_group()
+    cleanup_group.add_argument('--cleanup', dest='cleanup', action='store_true', default=None,
+                               help='Delete the test user afterwards (or set CLEANUP_TEST_USER=1)')
+    cleanup_group.add_argument('--keep-user', dest='cleanup', action='store_false',
+                               help='Keep the test user for manual testing (or set CLEANUP_TEST_USER=0)')
+    args = parser.parse_args()
+
     print("\nMulti-Step Registration Automation Example")
     print("=" * 60)
     print("\nBefore running:")
@@ -311,9 +606,11 @@ if __name__ == '__main__':
     print("3. Have database credentials ready")
     print("\n" + "=" * 60)
 
-    proceed = input("\nProceed with registration? (y/N): ").strip().lower()
-
-    if proceed == 'y':
-        register_user_complete_flow()
+    if args.yes or confirm('CONFIRM', "\nProceed with registration? (y/N): "):
+        register_user_complete_flow(
+            inspect=args.inspect,
+            headless=not args.headed,
+            cleanup=args.cleanup
+        )
     else:
         print("\nCancelled.")
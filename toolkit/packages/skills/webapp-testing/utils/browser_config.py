@@ -11,17 +11,133 @@ Usage:
         browser,
         'http://localhost:3000'
     )
+
+Browser binaries:
+    ensure_browsers_installed() runs `playwright install chromium` once per
+    process. The install is a no-op when the Chromium revision this Playwright
+    version expects is already in the browsers cache (Playwright's default, or
+    $PLAYWRIGHT_BROWSERS_PATH if set). In CI, cache that directory (e.g.
+    actions/cache keyed on `playwright --version`) to skip the download.
 """
 
+import os
+import re
+import subprocess
+import sys
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional, Dict
-from playwright.sync_api import Browser, BrowserContext
+from playwright.sync_api import Browser, BrowserContext, Playwright
 from urllib.parse import urlparse
 
 
+# Hostnames treated as local development (exact match, port stripped)
+_LOCAL_HOSTS = frozenset({
+    'localhost',
+    '127.0.0.1',
+    '0.0.0.0',
+    '::1',  # IPv6 localhost
+})
+
+# Loopback ranges that need prefix/suffix matching rather than exact lookup:
+# 127.0.0.0/8 and *.localhost subdomains (RFC 6761)
+_LOOPBACK_PREFIXES = ('127.',)
+_LOCALHOST_SUFFIXES = ('.localhost',)
+
+# Chromium switches for headless test throughput: no GPU, background
+# networking/throttling, extensions or crash reporting
+TEST_BROWSER_ARGS = [
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-breakpad',
+    '--disable-component-extensions-with-background-pages',
+    '--disable-extensions',
+    '--disable-features=TranslateUI,BlinkGenPropertyTrees',
+    '--disable-ipc-flooding-protection',
+    '--disable-renderer-backgrounding',
+    '--enable-features=NetworkService,NetworkServiceInProcess',
+    '--force-color-profile=srgb',
+    '--metrics-recording-only',
+    '--mute-audio',
+]
+
+# Third-party analytics/monitoring hosts that long-poll and skew load waits.
+# Matched against the hostname only (the domain or any subdomain), so a
+# first-party path or query mentioning e.g. analytics.io is left alone.
+ANALYTICS_HOST_PATTERN = re.compile(
+    r'(^|\.)(segment|analytics|googletagmanager|hotjar|sentry|posthog|fullstory)\.(com|io)$'
+)
+
+
+def _is_analytics_url(url: str) -> bool:
+    return bool(ANALYTICS_HOST_PATTERN.search((urlparse(url).hostname or '').lower()))
+
+# Static assets that screenshot-less runs don't need
+ASSET_URL_GLOB = '**/*.{png,jpg,jpeg,gif,woff,woff2}'
+
+# Videos go to tmpfs when available so frame writes stay in memory
+VIDEO_DIR = '/dev/shm/playwright-videos' if os.path.isdir('/dev/shm') else '/tmp/playwright-videos'
+
+
+@lru_cache(maxsize=None)
+def ensure_browsers_installed(with_deps: bool = False) -> None:
+    """
+    Make sure the Chromium build this Playwright version expects is installed.
+
+    `playwright install` is idempotent: it checks the exact revision and only
+    downloads when it is missing, so a build left behind by a Playwright
+    upgrade doesn't pass for the current one. Runs once per process.
+
+    Args:
+        with_deps: Also install system dependencies (needs root on Linux)
+    """
+    cmd = [sys.executable, '-m', 'playwright', 'install', 'chromium']
+    if with_deps:
+        cmd.append('--with-deps')
+    subprocess.run(cmd, check=True)
+
+
+def _sandbox_unavailable() -> bool:
+    """Chromium's sandbox can't start as root, and often not in CI containers."""
+    return (
+        (hasattr(os, 'geteuid') and os.geteuid() == 0)
+        or bool(os.environ.get('CI'))
+        or os.path.exists('/.dockerenv')
+    )
+
+
+@lru_cache(maxsize=1)
+def _device_sample() -> str:
+    """First few device names, for the unknown-device error message."""
+    from playwright.sync_api import devices
+    return ', '.join(list(devices.keys())[:5])
+
+
+@lru_cache(maxsize=32)
+def _mobile_options(device: str, bypass_csp: bool, ignore_https_errors: bool) -> MappingProxyType:
+    """Device descriptor merged with our defaults, built once per combination."""
+    from playwright.sync_api import devices
+
+    if device not in devices:
+        raise ValueError(
+            f"Unknown device: {device}. "
+            f"Available: {_device_sample()}, ..."
+        )
+
+    return MappingProxyType({
+        **devices[device],
+        'bypass_csp': bypass_csp,
+        'ignore_https_errors': ignore_https_errors,
+    })
+
+
 class BrowserConfig:
     """Smart browser configuration for testing environments"""
 
     @staticmethod
+    @lru_cache(maxsize=128)
     def is_localhost_url(url: str) -> bool:
         """
         Check if URL is localhost or local development environment.
@@ -30,31 +146,54 @@ class BrowserConfig:
             url: URL to check
 
         Returns:
-            True if localhost/127.0.0.1, False otherwise
+            True if localhost, 127.x.x.x, *.localhost or ::1, False otherwise
 
         Examples:
             >>> BrowserConfig.is_localhost_url('http://localhost:3000')
             True
             >>> BrowserConfig.is_localhost_url('http://127.0.0.1:8080')
             True
+            >>> BrowserConfig.is_localhost_url('http://app.localhost:5173')
+            True
             >>> BrowserConfig.is_localhost_url('https://production.com')
             False
+            >>> BrowserConfig.is_localhost_url('https://localhost.evil.com')
+            False
         """
         try:
-            parsed = urlparse(url)
-            hostname = parsed.hostname or parsed.netloc
-
-            localhost_patterns = [
-                'localhost',
-                '127.0.0.1',
-                '0.0.0.0',
-                '::1',  # IPv6 localhost
-            ]
-
-            return any(pattern in hostname.lower() for pattern in localhost_patterns)
+            hostname = (urlparse(url).hostname or '').lower()
+            if hostname in _LOCAL_HOSTS:
+                return True
+
+            # str.startswith/endswith with a tuple loop in C, no generator
+            if hostname.startswith(_LOOPBACK_PREFIXES):
+                return hostname.replace('.', '').isdigit()
+            return hostname.endswith(_LOCALHOST_SUFFIXES)
         except Exception:
             return False
 
+    @staticmethod
+    def launch_test_browser(playwright: Playwright, headless: bool = True) -> Browser:
+        """
+        Launch Chromium with switches tuned for automated testing.
+
+        The sandbox is only disabled when running as root or in CI/containers,
+        where Chromium can't start it; local runs keep it.
+
+        Args:
+            playwright: Started Playwright instance
+            headless: Run without a window
+
+        Returns:
+            Launched browser
+
+        Example:
+            with sync_playwright() as p:
+                browser = BrowserConfig.launch_test_browser(p)
+        """
+        args = TEST_BROWSER_ARGS + ['--no-sandbox'] if _sandbox_unavailable() else TEST_BROWSER_ARGS
+        return playwright.chromium.launch(headless=headless, args=args)
+
     @staticmethod
     def create_test_context(
         browser: Browser,
@@ -64,13 +203,19 @@ class BrowserConfig:
         extra_http_headers: Optional[Dict[str, str]] = None,
         viewport: Optional[Dict[str, int]] = None,
         record_video: bool = False,
+        record_video_size: Optional[Dict[str, int]] = None,
+        storage_state: Optional[str] = None,
+        trace: bool = False,
+        block_analytics: Optional[bool] = None,
+        block_assets: bool = False,
         verbose: bool = True
     ) -> BrowserContext:
         """
         Create browser context optimized for testing.
 
         Auto-detects CSP bypass need:
-        - If base_url contains 'localhost' or '127.0.0.1' → bypass_csp=True
+        - If base_url's host is local (see is_localhost_url(): localhost,
+          127.x.x.x, 0.0.0.0, ::1 or *.localhost) → bypass_csp=True
         - Otherwise → bypass_csp=False
 
         Args:
@@ -80,7 +225,17 @@ class BrowserConfig:
             ignore_https_errors: Ignore HTTPS errors (self-signed certs)
             extra_http_headers: Additional HTTP headers to send
             viewport: Custom viewport size (default: 1280x720)
-            record_video: Record video of test session
+            record_video: Record video of test session (saved under VIDEO_DIR)
+            record_video_size: Video frame size (default: 640x360, downscaled
+                from the viewport to cut encode and write cost)
+            storage_state: Path to a saved context.storage_state() file
+                (cookies + localStorage) to start already logged in
+            trace: Start Playwright tracing (DOM snapshots, screenshots,
+                network, actions); save it with BrowserConfig.save_trace()
+            block_analytics: Abort requests to analytics/monitoring hosts
+                (None = auto-detect, on for localhost)
+            block_assets: Abort image and font requests (only for runs
+                that take no screenshots)
             verbose: Print configuration choices
 
         Returns:
@@ -105,6 +260,10 @@ class BrowserConfig:
         if bypass_csp is None:
             bypass_csp = BrowserConfig.is_localhost_url(base_url)
 
+        # Block analytics by default when testing locally
+        if block_analytics is None:
+            block_analytics = BrowserConfig.is_localhost_url(base_url)
+
         # Default viewport for consistent testing
         if viewport is None:
             viewport = {'width': 1280, 'height': 720}
@@ -120,13 +279,29 @@ class BrowserConfig:
         if extra_http_headers:
             context_options['extra_http_headers'] = extra_http_headers
 
+        # Restore a saved login session
+        if storage_state:
+            context_options['storage_state'] = storage_state
+
         # Add video recording if requested
         if record_video:
-            context_options['record_video_dir'] = '/tmp/playwright-videos'
+            if record_video_size is None:
+                record_video_size = {'width': 640, 'height': 360}
+            context_options['record_video_dir'] = VIDEO_DIR
+            context_options['record_video_size'] = record_video_size
 
         # Create context
         context = browser.new_context(**context_options)
 
+        if trace:
+            context.tracing.start(screenshots=True, snapshots=True, sources=False)
+
+        # Short-circuit requests that only add network noise
+        if block_analytics:
+            context.route(_is_analytics_url, lambda route: route.abort())
+        if block_assets:
+            context.route(ASSET_URL_GLOB, lambda route: route.abort())
+
         # Print configuration for visibility
         if verbose:
             print("\n" + "=" * 60)
@@ -147,13 +322,43 @@ class BrowserConfig:
             if extra_http_headers:
                 print(f"  📨 Extra headers: {len(extra_http_headers)} header(s)")
 
+            if storage_state:
+                print(f"  🔑 Storage state: {storage_state}")
+
+            if trace:
+                print("  🧭 Tracing: ENABLED")
+
+            if block_analytics:
+                print("  🚫 Analytics requests: BLOCKED")
+
+            if block_assets:
+                print("  🚫 Images/fonts: BLOCKED")
+
             if record_video:
-                print("  🎥 Video recording: ENABLED")
+                print(f"  🎥 Video recording: ENABLED "
+                      f"({record_video_size['width']}x{record_video_size['height']} → {VIDEO_DIR})")
 
             print("=" * 60 + "\n")
 
         return context
 
+    @staticmethod
+    def save_trace(context: BrowserContext, path: str) -> str:
+        """
+        Stop tracing on a context created with trace=True and write the zip.
+
+        View it with `playwright show-trace <path>`.
+
+        Args:
+            context: Browser context with tracing started
+            path: Output .zip path
+
+        Returns:
+            The path written
+        """
+        context.tracing.stop(path=path)
+        return path
+
     @staticmethod
     def create_mobile_context(
         browser: Browser,
@@ -182,34 +387,18 @@ class BrowserConfig:
                 base_url='http://localhost:3000'
             )
         """
-        from playwright.sync_api import devices
-
-        # Get device descriptor
-        if device not in devices:
-            available = ', '.join(list(devices.keys())[:5])
-            raise ValueError(
-                f"Unknown device: {device}. "
-                f"Available: {available}, ..."
-            )
-
-        device_descriptor = devices[device]
-
         # Auto-detect CSP bypass
         if bypass_csp is None:
             bypass_csp = BrowserConfig.is_localhost_url(base_url)
 
-        # Merge with our defaults
-        context_options = {
-            **device_descriptor,
-            'bypass_csp': bypass_csp,
-            'ignore_https_errors': True,
-        }
+        # Device descriptor merged with our defaults (cached, read-only)
+        context_options = _mobile_options(device, bypass_csp, True)
 
         context = browser.new_context(**context_options)
 
         if verbose:
             print(f"\n📱 Mobile context: {device}")
-            print(f"   Viewport: {device_descriptor['viewport']}")
+            print(f"   Viewport: {context_options['viewport']}")
             if bypass_csp:
                 print(f"   🔓 CSP bypass: ENABLED")
             print()
@@ -8,24 +8,197 @@ Handles common form patterns across web applications:
 - Intelligent field detection
 """
 
-from playwright.sync_api import Page
-from typing import Dict, List, Any, Optional
+import asyncio
+from functools import lru_cache
+import random
+import re
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Page, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from typing import Callable, Dict, List, Any, Optional, Tuple
 import time
 
+from utils.page_scripts import page_function
+
+
+# Fields are only filled once known to be visible, so a stuck actionability
+# check should fail fast instead of waiting out Playwright's 30s default
+_FILL_TIMEOUT = 2000
+
+# Password inputs the user could actually type into
+_PASSWORD_VISIBLE = 'input[type="password"] >> visible=true'
+
+# Fills several fields in one page.evaluate round-trip. Values go through the
+# native HTMLInputElement setter so React-style controlled inputs notice them.
+_BULK_FILL_JS = page_function('[fields, confirmPassword]', """
+    const filled = [];
+    for (const [key, selectors, value] of fields) {
+        for (const selector of selectors) {
+            const matches = [...document.querySelectorAll(selector)].filter(visible);
+            if (!matches.length) continue;
+            setNativeValue(matches[0], value);
+            if (key === 'password' && confirmPassword && matches[1]) setNativeValue(matches[1], value);
+            filled.push(key);
+            break;
+        }
+    }
+    return filled;
+""")
+
+# Sets the password (and optionally the confirmation) in one page.evaluate,
+# using the same native setter trick. Only visible, editable inputs count, so
+# hidden templates or disabled fields can't pass for a filled form. Returns
+# how many fields were filled (0 sends callers to the waited fallback).
+_PASSWORD_FILL_JS = page_function('[value, confirm]', """
+    const inputs = [...document.querySelectorAll('input[type="password"]')]
+        .filter(el => visible(el) && !el.disabled && !el.readOnly)
+        .slice(0, confirm ? 2 : 1);
+    inputs.forEach(el => setNativeValue(el, value));
+    return inputs.length;
+""")
+
+
+# Sets one element's value through the native setter, without focusing it, so
+# several fields can be filled concurrently.
+_SET_VALUE_JS = page_function('el, value', """
+    setNativeValue(el, value);
+""")
+
+# Whether the first match for a CSS selector is visible
+_VISIBLE_JS = page_function('selector', """
+    const el = document.querySelector(selector);
+    return !!el && visible(el);
+""")
+
+
+# For each named group of CSS selectors, the first selector with a visible
+# match (or null). One DOM pass covers every group.
+_PICK_JS = page_function('groups', """
+    const pick = selectors => selectors.find(s => [...document.querySelectorAll(s)].some(visible)) || null;
+    return Object.fromEntries(Object.entries(groups).map(([name, selectors]) => [name, pick(selectors)]));
+""")
+
+
+def _pick(page: Page, groups: Dict[str, Tuple[str, ...]]) -> Dict[str, Optional[str]]:
+    """
+    Resolve several selector groups in a single evaluate.
+
+    Args:
+        page: Playwright Page object
+        groups: Group name -> CSS selectors in priority order
+
+    Returns:
+        Group name -> first selector with a visible match, or None
+    """
+    return page.evaluate(_PICK_JS, {name: list(selectors) for name, selectors in groups.items()})
+
+
+def _visible(page: Page, selector: str) -> bool:
+    """
+    Check in one evaluate whether the first element matching selector is visible.
+
+    Falls back to Locator.is_visible() for selectors querySelector can't
+    parse (e.g. Playwright's text= or :has-text()).
+    """
+    try:
+        return page.evaluate(_VISIBLE_JS, selector)
+    except PlaywrightError:
+        return page.locator(selector).first.is_visible()
+
+
+def _probe(page: Page, selector: str):
+    """
+    Return a locator for the first match if it is visible right now, else None.
+
+    No polling: a miss costs one round-trip instead of a visibility timeout.
+    """
+    return page.locator(selector).first if _visible(page, selector) else None
+
 
 class SmartFormFiller:
     """
     Intelligent form filling that handles variations in field structures.
 
+    All methods are static and the class holds no state, so call them on the
+    class directly; there is no need to instantiate it.
+
     Example:
         ```python
-        filler = SmartFormFiller()
-        filler.fill_name_field(page, "John Doe")  # Tries full name or first/last
-        filler.fill_email_field(page, "test@example.com")
-        filler.fill_password_fields(page, "SecurePass123!")
+        SmartFormFiller.fill_name_field(page, "John Doe")  # Tries full name or first/last
+        SmartFormFiller.fill_email_field(page, "test@example.com")
+        SmartFormFiller.fill_password_fields(page, "SecurePass123!")
         ```
     """
 
+    FULL_NAME_SELECTORS = (
+        'input[name*="full" i][name*="name" i]',
+        'input[placeholder*="full name" i]',
+        'input[placeholder*="name" i]',
+        'input[id*="fullname" i]',
+        'input[id*="full-name" i]',
+    )
+
+    EMAIL_SELECTORS = (
+        'input[type="email"]',
+        'input[name="email" i]',
+        'input[placeholder*="email" i]',
+        'input[id*="email" i]',
+        'input[autocomplete="email"]',
+    )
+
+    PHONE_SELECTORS = (
+        'input[type="tel"]',
+        'input[name*="phone" i]',
+        'input[placeholder*="phone" i]',
+        'input[id*="phone" i]',
+        'input[autocomplete="tel"]',
+    )
+
+    FIRST_NAME_SELECTORS = (
+        'input[name*="first" i][name*="name" i]',
+        'input[placeholder*="first name" i]',
+        'input[id*="firstname" i]',
+        'input[id*="first-name" i]',
+    )
+
+    LAST_NAME_SELECTORS = (
+        'input[name*="last" i][name*="name" i]',
+        'input[placeholder*="last name" i]',
+        'input[id*="lastname" i]',
+        'input[id*="last-name" i]',
+    )
+
+    # Union queries joined once at import time rather than on every lookup
+    FULL_NAME_UNION = ', '.join(FULL_NAME_SELECTORS)
+    EMAIL_UNION = ', '.join(EMAIL_SELECTORS)
+    PHONE_UNION = ', '.join(PHONE_SELECTORS)
+    FIRST_NAME_UNION = ', '.join(FIRST_NAME_SELECTORS)
+    LAST_NAME_UNION = ', '.join(LAST_NAME_SELECTORS)
+    ANY_NAME_UNION = ', '.join(FULL_NAME_SELECTORS + FIRST_NAME_SELECTORS + LAST_NAME_SELECTORS)
+
+    @staticmethod
+    def _first_visible(page: Page, union: str):
+        """
+        Locator for the first visible element matching a union selector.
+
+        The union is resolved in one querySelectorAll instead of one
+        round-trip per selector.
+        """
+        return page.locator(f"{union} >> visible=true").first
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _date_selectors(field_hint: str = None) -> Tuple[str, ...]:
+        """Date input selectors, narrowed by an optional hint like "birth"."""
+        if not field_hint:
+            return ('input[type="date"]',)
+
+        return (
+            'input[type="date"]',
+            f'input[name*="{field_hint}" i]',
+            f'input[placeholder*="{field_hint}" i]',
+            f'input[id*="{field_hint}" i]',
+        )
+
     @staticmethod
     def fill_name_field(page: Page, full_name: str, timeout: int = 5000) -> bool:
         """
@@ -47,69 +220,50 @@ class SmartFormFiller:
             fill_name_field(page, "Jane Smith")
             ```
         """
-        # Strategy 1: Try single "Full Name" field
-        full_name_selectors = [
-            'input[name*="full" i][name*="name" i]',
-            'input[placeholder*="full name" i]',
-            'input[placeholder*="name" i]',
-            'input[id*="fullname" i]',
-            'input[id*="full-name" i]',
-        ]
+        filler = SmartFormFiller
+
+        # Wait once for any name field, then see which layout the form uses
+        any_name = filler._first_visible(page, filler.ANY_NAME_UNION)
+        try:
+            any_name.wait_for(state='visible', timeout=timeout)
+        except PlaywrightTimeoutError:
+            return False
+
+        # Resolve full, first and last name fields in one DOM pass
+        try:
+            found = _pick(page, {
+                'full': filler.FULL_NAME_SELECTORS,
+                'first': filler.FIRST_NAME_SELECTORS,
+                'last': filler.LAST_NAME_SELECTORS,
+            })
+        except PlaywrightError:
+            return False
 
-        for selector in full_name_selectors:
+        # Strategy 1: Try single "Full Name" field
+        if found['full']:
             try:
-                field = page.locator(selector).first
-                if field.is_visible(timeout=1000):
-                    field.fill(full_name)
-                    return True
-            except:
-                continue
+                field = page.locator(f"{found['full']} >> visible=true").first
+                field.fill(full_name, timeout=_FILL_TIMEOUT)
+                return True
+            except PlaywrightError:
+                pass
 
         # Strategy 2: Try separate First/Last Name fields
         parts = full_name.split(' ', 1)
         first_name = parts[0] if parts else full_name
         last_name = parts[1] if len(parts) > 1 else ''
 
-        first_name_selectors = [
-            'input[name*="first" i][name*="name" i]',
-            'input[placeholder*="first name" i]',
-            'input[id*="firstname" i]',
-            'input[id*="first-name" i]',
-        ]
-
-        last_name_selectors = [
-            'input[name*="last" i][name*="name" i]',
-            'input[placeholder*="last name" i]',
-            'input[id*="lastname" i]',
-            'input[id*="last-name" i]',
-        ]
-
-        first_filled = False
-        last_filled = False
-
-        # Fill first name
-        for selector in first_name_selectors:
-            try:
-                field = page.locator(selector).first
-                if field.is_visible(timeout=1000):
-                    field.fill(first_name)
-                    first_filled = True
-                    break
-            except:
+        filled = False
+        for selector, value in ((found['first'], first_name), (found['last'], last_name)):
+            if not selector:
                 continue
-
-        # Fill last name
-        for selector in last_name_selectors:
             try:
-                field = page.locator(selector).first
-                if field.is_visible(timeout=1000):
-                    field.fill(last_name)
-                    last_filled = True
-                    break
-            except:
-                continue
+                page.locator(f"{selector} >> visible=true").first.fill(value, timeout=_FILL_TIMEOUT)
+                filled = True
+            except PlaywrightError:
+                pass
 
-        return first_filled or last_filled
+        return filled
 
     @staticmethod
     def fill_email_field(page: Page, email: str, timeout: int = 5000) -> bool:
@@ -124,24 +278,13 @@ class SmartFormFiller:
         Returns:
             True if successful, False otherwise
         """
-        email_selectors = [
-            'input[type="email"]',
-            'input[name="email" i]',
-            'input[placeholder*="email" i]',
-            'input[id*="email" i]',
-            'input[autocomplete="email"]',
-        ]
-
-        for selector in email_selectors:
-            try:
-                field = page.locator(selector).first
-                if field.is_visible(timeout=1000):
-                    field.fill(email)
-                    return True
-            except:
-                continue
-
-        return False
+        field = SmartFormFiller._first_visible(page, SmartFormFiller.EMAIL_UNION)
+        try:
+            field.wait_for(state='visible', timeout=timeout)
+            field.fill(email, timeout=_FILL_TIMEOUT)
+            return True
+        except PlaywrightError:
+            return False
 
     @staticmethod
     def fill_password_fields(page: Page, password: str, confirm: bool = True, timeout: int = 5000) -> bool:
@@ -157,22 +300,31 @@ class SmartFormFiller:
         Returns:
             True if successful, False otherwise
         """
-        password_fields = page.locator('input[type="password"]').all()
+        # Fast path: both fields in a single round-trip
+        try:
+            if page.evaluate(_PASSWORD_FILL_JS, [password, confirm]):
+                return True
+        except PlaywrightError:
+            pass
 
-        if not password_fields:
+        # Fields not rendered yet (or evaluate failed): wait, then fill normally
+        password_fields = page.locator(_PASSWORD_VISIBLE)
+        try:
+            password_fields.first.wait_for(timeout=timeout)
+        except PlaywrightTimeoutError:
             return False
 
         # Fill first password field
         try:
-            password_fields[0].fill(password)
-        except:
+            password_fields.nth(0).fill(password, timeout=_FILL_TIMEOUT)
+        except PlaywrightError:
             return False
 
         # Fill confirmation field if requested and exists
-        if confirm and len(password_fields) > 1:
+        if confirm and password_fields.count() > 1:
             try:
-                password_fields[1].fill(password)
-            except:
+                password_fields.nth(1).fill(password, timeout=_FILL_TIMEOUT)
+            except PlaywrightError:
                 pass
 
         return True
@@ -190,24 +342,13 @@ class SmartFormFiller:
         Returns:
             True if successful, False otherwise
         """
-        phone_selectors = [
-            'input[type="tel"]',
-            'input[name*="phone" i]',
-            'input[placeholder*="phone" i]',
-            'input[id*="phone" i]',
-            'input[autocomplete="tel"]',
-        ]
-
-        for selector in phone_selectors:
-            try:
-                field = page.locator(selector).first
-                if field.is_visible(timeout=1000):
-                    field.fill(phone)
-                    return True
-            except:
-                continue
-
-        return False
+        field = SmartFormFiller._first_visible(page, SmartFormFiller.PHONE_UNION)
+        try:
+            field.wait_for(state='visible', timeout=timeout)
+            field.fill(phone, timeout=_FILL_TIMEOUT)
+            return True
+        except PlaywrightError:
+            return False
 
     @staticmethod
     def fill_date_field(page: Page, date_value: str, field_hint: str = None, timeout: int = 5000) -> bool:
@@ -228,37 +369,290 @@ class SmartFormFiller:
             fill_date_field(page, "1990-01-15", field_hint="birth")
             ```
         """
-        # Build selectors based on hint
-        date_selectors = ['input[type="date"]']
+        selectors = SmartFormFiller._date_selectors(field_hint)
+        try:
+            page.wait_for_selector(', '.join(selectors), state='visible', timeout=timeout)
+            selector = _pick(page, {'date': selectors})['date']
+            if not selector:
+                return False
+            field = page.locator(f"{selector} >> visible=true").first
+            field.fill(date_value, timeout=_FILL_TIMEOUT)
+            return True
+        except PlaywrightError:
+            return False
+
+    @staticmethod
+    def fill_step_bulk(
+        page: Page,
+        data: Dict[str, str],
+        confirm_password: bool = True,
+        date_hint: str = 'birth'
+    ) -> Dict[str, bool]:
+        """
+        Fill all fields of a form step in a single browser round-trip.
+
+        Uses the same selectors as the fill_*_field methods, but resolves and
+        fills every field inside one page.evaluate(), dispatching input/change
+        events. Fields the script can't find fall back to the per-field
+        Playwright methods (e.g. separate first/last name inputs).
+
+        Args:
+            page: Playwright Page object
+            data: Field values keyed by 'email', 'password', 'full_name',
+                'phone' or 'date_of_birth'
+            confirm_password: Also fill a second password field if present
+            date_hint: Hint used to locate the date field
+
+        Returns:
+            Dictionary mapping each key in data to fill success
+
+        Example:
+            ```python
+            SmartFormFiller.fill_step_bulk(page, {
+                'full_name': 'Test User',
+                'date_of_birth': '1990-01-15',
+                'phone': '+447700900123',
+            })
+            ```
+        """
+        field_selectors = {
+            'email': SmartFormFiller.EMAIL_SELECTORS,
+            'password': ('input[type="password"]',),
+            'full_name': SmartFormFiller.FULL_NAME_SELECTORS,
+            'phone': SmartFormFiller.PHONE_SELECTORS,
+            'date_of_birth': SmartFormFiller._date_selectors(date_hint),
+        }
+
+        fields = [
+            [key, list(field_selectors[key]), value]
+            for key, value in data.items()
+            if key in field_selectors
+        ]
 
-        if field_hint:
-            date_selectors.extend([
-                f'input[name*="{field_hint}" i]',
-                f'input[placeholder*="{field_hint}" i]',
-                f'input[id*="{field_hint}" i]',
-            ])
+        try:
+            filled = set(page.evaluate(_BULK_FILL_JS, [fields, confirm_password]))
+        except PlaywrightError:
+            filled = set()
+
+        fallbacks = {
+            'email': lambda v: SmartFormFiller.fill_email_field(page, v),
+            'password': lambda v: SmartFormFiller.fill_password_fields(page, v, confirm=confirm_password),
+            'full_name': lambda v: SmartFormFiller.fill_name_field(page, v),
+            'phone': lambda v: SmartFormFiller.fill_phone_field(page, v),
+            'date_of_birth': lambda v: SmartFormFiller.fill_date_field(page, v, field_hint=date_hint),
+        }
+
+        results = {}
+        for key, value in data.items():
+            if key in filled:
+                results[key] = True
+            elif key in fallbacks:
+                results[key] = fallbacks[key](value)
+            else:
+                results[key] = False
+
+        return results
+
+
+def _date_hint(field_type: str) -> str:
+    """Date field hint from a key like 'date_of_birth' -> 'birth'."""
+    return re.sub(r'^date_(of_)?', '', field_type).replace('_', ' ')
+
+
+def _fill_date_with_hint(page: Page, value: str, field_type: str) -> bool:
+    return SmartFormFiller.fill_date_field(page, value, field_hint=_date_hint(field_type))
+
+
+# Fill handlers for exact field keys
+FIELD_HANDLERS: Dict[str, Callable[[Page, str], bool]] = {
+    'email': SmartFormFiller.fill_email_field,
+    'password': SmartFormFiller.fill_password_fields,
+    'full_name': SmartFormFiller.fill_name_field,
+    'phone': SmartFormFiller.fill_phone_field,
+}
+
+# Fallbacks for other keys ('first_name', 'mobile_phone', 'date_of_birth'),
+# checked in order and keyed by the field kind they resolve to. Handlers also
+# receive the key, e.g. for the date hint. The name pattern is anchored so
+# 'username' or 'company_name' aren't split into first and last names.
+FIELD_PATTERNS: Dict[str, Tuple[re.Pattern, Callable[[Page, str, str], bool]]] = {
+    'name': (re.compile(r'^(full_?)?name$|^(first|last)_?name$', re.I),
+             lambda page, value, _: SmartFormFiller.fill_name_field(page, value)),
+    'phone': (re.compile(r'phone', re.I), lambda page, value, _: SmartFormFiller.fill_phone_field(page, value)),
+    'date': (re.compile(r'date', re.I), _fill_date_with_hint),
+}
+
+
+def _field_handler(field_type: str) -> Optional[Callable[[Page, str], bool]]:
+    """
+    Look up the fill handler for a field key.
 
-        for selector in date_selectors:
-            try:
-                field = page.locator(selector).first
-                if field.is_visible(timeout=1000):
-                    field.fill(date_value)
-                    return True
-            except:
-                continue
+    Exact keys in FIELD_HANDLERS win; otherwise the first matching entry in
+    FIELD_PATTERNS is used. Register new field types in either table.
+
+    Returns:
+        handler(page, value) -> bool, or None if the key is unknown
+    """
+    handler = FIELD_HANDLERS.get(field_type)
+    if handler:
+        return handler
+
+    for pattern, fill in FIELD_PATTERNS.values():
+        if pattern.search(field_type):
+            return lambda page, value: fill(page, value, field_type)
+
+    return None
 
+
+# Waits until an element holds the expected value. Takes the element itself
+# so Playwright-only selectors (text=, :has-text()) work too.
+_VALUE_SET_JS = "([el, value]) => el.value === value"
+
+
+def _field_key(field_type: str) -> Optional[str]:
+    """
+    Resolve a field key the same way _field_handler() does.
+
+    Returns:
+        The exact FIELD_HANDLERS key, the key of the first matching
+        FIELD_PATTERNS entry (e.g. 'phone' for 'mobile_phone'), or None
+    """
+    if field_type in FIELD_HANDLERS:
+        return field_type
+
+    for kind, (pattern, _) in FIELD_PATTERNS.items():
+        if pattern.search(field_type):
+            return kind
+
+    return None
+
+
+# Union selector per resolved key (see _field_key). Builders receive the
+# original key, e.g. for the date hint.
+_FIELD_UNIONS: Dict[str, Callable[[str], str]] = {
+    'email': lambda _: SmartFormFiller.EMAIL_UNION,
+    'password': lambda _: 'input[type="password"]',
+    'full_name': lambda _: SmartFormFiller.ANY_NAME_UNION,
+    'phone': lambda _: SmartFormFiller.PHONE_UNION,
+    'name': lambda _: SmartFormFiller.ANY_NAME_UNION,
+    'date': lambda field_type: ', '.join(SmartFormFiller._date_selectors(_date_hint(field_type))),
+}
+
+
+def _field_union(field_type: str) -> Optional[str]:
+    """Union selector for a field type as used in step configs, or None if unknown."""
+    build = _FIELD_UNIONS.get(_field_key(field_type))
+    return build(field_type) if build else None
+
+
+# Finds the first visible button whose label matches a pattern (patterns in
+# priority order; null means any type="submit" button) and returns the element
+# itself, so the page's DOM is left untouched. One DOM walk per poll.
+_BUTTON_MATCH_JS = page_function('patterns', """
+    const label = el => (el.innerText || el.value || '').trim();
+    const buttons = [...document.querySelectorAll('button, input[type="submit"], [role="button"]')]
+        .filter(visible);
+
+    for (const pattern of patterns) {
+        const re = pattern === null ? null : new RegExp(pattern, 'i');
+        const hit = buttons.find(b => re ? re.test(label(b)) : b.getAttribute('type') === 'submit');
+        if (hit) return hit;
+    }
+    return null;
+""")
+
+
+def _continue_patterns(continue_button_text: str) -> List[Optional[str]]:
+    """Label patterns for buttons that advance a multi-step form, in priority order."""
+    return [re.escape(continue_button_text), None, 'next', 'continue']
+
+
+# Label patterns for buttons that finish a multi-step form, in priority order
+_COMPLETE_PATTERNS = ['complete', 'finish', 'submit', None]
+
+
+def _find_step_button(page: Page, patterns: List[Optional[str]], timeout: int):
+    """
+    Wait for a button matching any label pattern, checking them all in-page.
+
+    Returns:
+        ElementHandle for the matched button, or None
+    """
+    try:
+        return page.wait_for_function(_BUTTON_MATCH_JS, arg=patterns, timeout=timeout).as_element()
+    except PlaywrightError:
+        return None
+
+
+async def _find_step_button_async(page: AsyncPage, patterns: List[Optional[str]], timeout: int):
+    """Async counterpart of _find_step_button()."""
+    try:
+        return (await page.wait_for_function(_BUTTON_MATCH_JS, arg=patterns, timeout=timeout)).as_element()
+    except PlaywrightError:
+        return None
+
+
+# Shown by forms that finish without navigating away. Only messages that
+# appear after submitting count, so a heading that was already there doesn't.
+_SUCCESS_TEXT = "text=/success|thank you/i >> visible=true"
+
+
+def _wait_for_completion(page: Page, pre_click_url: str, pre_click_messages: int) -> bool:
+    """
+    True once the URL changes or a new success message appears after submitting.
+
+    Args:
+        pre_click_url: page.url before clicking the button
+        pre_click_messages: Visible _SUCCESS_TEXT matches before clicking
+    """
+    try:
+        page.wait_for_url(lambda url: url != pre_click_url, timeout=10000)
+        return True
+    except PlaywrightTimeoutError:
+        pass
+
+    try:
+        page.locator(_SUCCESS_TEXT).nth(pre_click_messages).wait_for(timeout=5000)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def _wait_for_completion_async(page: AsyncPage, pre_click_url: str, pre_click_messages: int) -> bool:
+    """Async counterpart of _wait_for_completion()."""
+    try:
+        await page.wait_for_url(lambda url: url != pre_click_url, timeout=10000)
+        return True
+    except PlaywrightTimeoutError:
+        pass
+
+    try:
+        await page.locator(_SUCCESS_TEXT).nth(pre_click_messages).wait_for(timeout=5000)
+        return True
+    except PlaywrightTimeoutError:
         return False
 
 
-def fill_with_retry(page: Page, selectors: List[str], value: str, max_attempts: int = 3) -> bool:
+def fill_with_retry(
+    page: Page,
+    selectors: List[str],
+    value: str,
+    max_attempts: int = 3,
+    jitter: float = 0.1
+) -> bool:
     """
     Try multiple selectors with retry logic.
 
+    Waits for the value to land in the field rather than sleeping, and backs
+    off exponentially between failed attempts.
+
     Args:
         page: Playwright Page object
         selectors: List of CSS selectors to try
         value: Value to fill
         max_attempts: Maximum retry attempts per selector
+        jitter: Maximum random delay (seconds) added to each backoff, so
+            concurrent tests don't retry in lockstep
 
     Returns:
         True if any selector succeeded, False otherwise
@@ -272,21 +666,64 @@ def fill_with_retry(page: Page, selectors: List[str], value: str, max_attempts:
     for selector in selectors:
         for attempt in range(max_attempts):
             try:
-                field = page.locator(selector).first
-                if field.is_visible(timeout=1000):
-                    field.fill(value)
-                    time.sleep(0.3)
+                field = _probe(page, selector)
+                if field:
+                    field.fill(value, timeout=_FILL_TIMEOUT)
                     # Verify value was set
-                    if field.input_value() == value:
-                        return True
-            except:
+                    page.wait_for_function(_VALUE_SET_JS, arg=[field.element_handle(), value], timeout=1500)
+                    return True
+            except PlaywrightError:
                 if attempt < max_attempts - 1:
-                    time.sleep(0.5)
+                    time.sleep(0.1 * 2 ** attempt + random.uniform(0, jitter))
                 continue
 
     return False
 
 
+def _plan_step(steps: List[Dict[str, Any]], i: int, continue_button_text: str) -> Dict[str, Any]:
+    """
+    Work out what to do for step i, independent of the sync or async API.
+
+    Returns:
+        Dictionary with:
+        - fields: (field_type, key, value) for fields with a handler, key as
+          resolved by _field_key()
+        - unknown: field types without a handler
+        - checkbox: whether to check the first checkbox
+        - wait_after: extra wait in seconds, or None
+        - buttons: label patterns for the button to click, or None to stop
+        - completes: True if clicking the button should finish the form
+        - missing_button: warning to print when no button matches
+        - anchor: union selector for the next step's fields, or None
+    """
+    step = steps[i]
+    fields = [(field_type, _field_key(field_type), value) for field_type, value in step.get('fields', {}).items()]
+    last = i == len(steps) - 1
+    completes = last and step.get('complete', False)
+
+    if not last:
+        buttons = _continue_patterns(continue_button_text)
+        missing_button = f"    Warning: Could not find continue button for step {i+1}"
+    elif completes:
+        buttons = _COMPLETE_PATTERNS
+        missing_button = "    Warning: Could not find completion button"
+    else:
+        buttons = missing_button = None
+
+    anchors = [] if last else [u for u in map(_field_union, steps[i + 1].get('fields', {})) if u]
+
+    return {
+        'fields': [f for f in fields if f[1]],
+        'unknown': [f[0] for f in fields if not f[1]],
+        'checkbox': 'checkbox' in step,
+        'wait_after': step.get('wait_after'),
+        'buttons': buttons,
+        'completes': completes,
+        'missing_button': missing_button,
+        'anchor': ', '.join(anchors) or None,
+    }
+
+
 def handle_multi_step_form(page: Page, steps: List[Dict[str, Any]], continue_button_text: str = "CONTINUE") -> bool:
     """
     Automate multi-step form completion.
@@ -297,7 +734,8 @@ def handle_multi_step_form(page: Page, steps: List[Dict[str, Any]], continue_but
         continue_button_text: Text of button to advance steps
 
     Returns:
-        True if all steps completed successfully, False otherwise
+        True if all steps completed and, for a completing step, the page
+        redirected or showed a success message; False otherwise
 
     Example:
         ```python
@@ -305,7 +743,7 @@ def handle_multi_step_form(page: Page, steps: List[Dict[str, Any]], continue_but
             {
                 'fields': {'email': 'test@example.com', 'password': 'Pass123!'},
                 'checkbox': 'terms',  # Optional checkbox to check
-                'wait_after': 2,  # Optional wait time after step
+                'wait_after': 2,  # Optional extra wait (seconds) after step
             },
             {
                 'fields': {'full_name': 'John Doe', 'date_of_birth': '1990-01-15'},
@@ -317,96 +755,178 @@ def handle_multi_step_form(page: Page, steps: List[Dict[str, Any]], continue_but
         handle_multi_step_form(page, steps)
         ```
     """
-    filler = SmartFormFiller()
-
-    for i, step in enumerate(steps):
+    for i in range(len(steps)):
         print(f"  Processing step {i+1}/{len(steps)}...")
+        plan = _plan_step(steps, i, continue_button_text)
 
         # Fill fields in this step
-        if 'fields' in step:
-            for field_type, value in step['fields'].items():
-                if field_type == 'email':
-                    filler.fill_email_field(page, value)
-                elif field_type == 'password':
-                    filler.fill_password_fields(page, value)
-                elif field_type == 'full_name':
-                    filler.fill_name_field(page, value)
-                elif field_type == 'phone':
-                    filler.fill_phone_field(page, value)
-                elif field_type.startswith('date'):
-                    hint = field_type.replace('date_', '').replace('_', ' ')
-                    filler.fill_date_field(page, value, field_hint=hint)
-                else:
-                    # Generic field - try to find and fill
-                    print(f"    Warning: Unknown field type '{field_type}'")
+        for field_type, _, value in plan['fields']:
+            _field_handler(field_type)(page, value)
+        for field_type in plan['unknown']:
+            print(f"    Warning: Unknown field type '{field_type}'")
 
         # Check checkbox if specified
-        if 'checkbox' in step:
+        if plan['checkbox']:
             try:
-                checkbox = page.locator('input[type="checkbox"]').first
-                checkbox.check()
-            except:
+                page.locator('input[type="checkbox"]').first.check()
+            except PlaywrightError:
                 print(f"    Warning: Could not check checkbox")
 
         # Wait if specified
-        if 'wait_after' in step:
-            time.sleep(step['wait_after'])
-        else:
-            time.sleep(1)
-
-        # Click continue/submit button
-        if i < len(steps) - 1:  # Not the last step
-            button_selectors = [
-                f'button:has-text("{continue_button_text}")',
-                'button[type="submit"]',
-                'button:has-text("Next")',
-                'button:has-text("Continue")',
-            ]
-
-            clicked = False
-            for selector in button_selectors:
-                try:
-                    button = page.locator(selector).first
-                    if button.is_visible(timeout=2000):
-                        button.click()
-                        clicked = True
-                        break
-                except:
-                    continue
-
-            if not clicked:
-                print(f"    Warning: Could not find continue button for step {i+1}")
+        if plan['wait_after']:
+            time.sleep(plan['wait_after'])
+
+        # Click continue/complete button
+        if not plan['buttons']:
+            continue
+
+        button = _find_step_button(page, plan['buttons'], timeout=2000)
+        pre_click_url = page.url
+        pre_click_messages = page.locator(_SUCCESS_TEXT).count() if plan['completes'] else 0
+        clicked = False
+        if button:
+            try:
+                button.click()
+                clicked = True
+            except PlaywrightError:
+                pass
+
+        if not clicked:
+            print(plan['missing_button'])
+            return False
+
+        if plan['completes']:
+            if not _wait_for_completion(page, pre_click_url, pre_click_messages):
+                print("    Warning: No redirect or success message after completing")
                 return False
+            return True
+
+        # Wait for next step to load: its first field becomes visible
+        page.wait_for_load_state('domcontentloaded')
+        if plan['anchor']:
+            try:
+                page.wait_for_selector(plan['anchor'], state='visible', timeout=10000)
+            except PlaywrightTimeoutError:
+                print(f"    Warning: Step {i+2} fields did not appear")
+
+    return True
+
+
+async def _fill_field_async(page: AsyncPage, field_type: str, key: str, value: str, timeout: int = 5000) -> bool:
+    """
+    Fill one step field with the async API.
+
+    Values are set through the native setter rather than Locator.fill(),
+    which focuses the element and types into whatever has focus - unsafe
+    when several fields are filled at once.
+
+    Args:
+        field_type: Field key from the step config, e.g. 'date_of_birth'
+        key: field_type as resolved by _field_key(), e.g. 'date'
+    """
+    try:
+        if key == 'password':
+            # Polls until a visible, editable password field exists and fills it
+            await page.wait_for_function(_PASSWORD_FILL_JS, arg=[value, True], timeout=timeout)
+            return True
+
+        if key in ('full_name', 'name'):
+            await page.locator(f"{SmartFormFiller.ANY_NAME_UNION} >> visible=true").first.wait_for(timeout=timeout)
+            full = page.locator(f"{SmartFormFiller.FULL_NAME_UNION} >> visible=true").first
+            if await full.count():
+                await full.evaluate(_SET_VALUE_JS, value)
+                return True
+
+            first_name, _, last_name = value.partition(' ')
+            filled = False
+            for union, part in ((SmartFormFiller.FIRST_NAME_UNION, first_name),
+                                (SmartFormFiller.LAST_NAME_UNION, last_name)):
+                field = page.locator(f"{union} >> visible=true").first
+                if await field.count():
+                    await field.evaluate(_SET_VALUE_JS, part)
+                    filled = True
+            return filled
+
+        field = page.locator(f"{_FIELD_UNIONS[key](field_type)} >> visible=true").first
+        await field.wait_for(timeout=timeout)
+        await field.evaluate(_SET_VALUE_JS, value)
+        return True
+    except PlaywrightError:
+        return False
+
+
+async def handle_multi_step_form_async(
+    page: AsyncPage,
+    steps: List[Dict[str, Any]],
+    continue_button_text: str = "CONTINUE"
+) -> bool:
+    """
+    Async variant of handle_multi_step_form() for playwright.async_api pages.
+
+    Takes the same step configs. The fields within a step are independent,
+    so they are filled concurrently with asyncio.gather.
+
+    Example:
+        ```python
+        async with async_playwright() as p:
+            browser = await p.chromium.launch()
+            page = await browser.new_page()
+            await page.goto(url)
+            await handle_multi_step_form_async(page, steps)
+        ```
+    """
+    for i in range(len(steps)):
+        print(f"  Processing step {i+1}/{len(steps)}...")
+        plan = _plan_step(steps, i, continue_button_text)
+
+        # Fill fields in this step, all at once
+        await asyncio.gather(*(_fill_field_async(page, *field) for field in plan['fields']))
+        for field_type in plan['unknown']:
+            print(f"    Warning: Unknown field type '{field_type}'")
 
-            # Wait for next step to load
-            page.wait_for_load_state('networkidle')
-            time.sleep(2)
-
-        else:  # Last step
-            if step.get('complete', False):
-                complete_selectors = [
-                    'button:has-text("COMPLETE")',
-                    'button:has-text("Complete")',
-                    'button:has-text("FINISH")',
-                    'button:has-text("Finish")',
-                    'button:has-text("SUBMIT")',
-                    'button:has-text("Submit")',
-                    'button[type="submit"]',
-                ]
-
-                for selector in complete_selectors:
-                    try:
-                        button = page.locator(selector).first
-                        if button.is_visible(timeout=2000):
-                            button.click()
-                            page.wait_for_load_state('networkidle')
-                            time.sleep(3)
-                            return True
-                    except:
-                        continue
-
-                print("    Warning: Could not find completion button")
+        # Check checkbox if specified
+        if plan['checkbox']:
+            try:
+                await page.locator('input[type="checkbox"]').first.check()
+            except PlaywrightError:
+                print(f"    Warning: Could not check checkbox")
+
+        # Wait if specified
+        if plan['wait_after']:
+            await asyncio.sleep(plan['wait_after'])
+
+        # Click continue/complete button
+        if not plan['buttons']:
+            continue
+
+        button = await _find_step_button_async(page, plan['buttons'], timeout=2000)
+        pre_click_url = page.url
+        pre_click_messages = await page.locator(_SUCCESS_TEXT).count() if plan['completes'] else 0
+        clicked = False
+        if button:
+            try:
+                await button.click()
+                clicked = True
+            except PlaywrightError:
+                pass
+
+        if not clicked:
+            print(plan['missing_button'])
+            return False
+
+        if plan['completes']:
+            if not await _wait_for_completion_async(page, pre_click_url, pre_click_messages):
+                print("    Warning: No redirect or success message after completing")
                 return False
+            return True
+
+        # Wait for next step to load: its first field becomes visible
+        await page.wait_for_load_state('domcontentloaded')
+        if plan['anchor']:
+            try:
+                await page.wait_for_selector(plan['anchor'], state='visible', timeout=10000)
+            except PlaywrightTimeoutError:
+                print(f"    Warning: Step {i+2} fields did not appear")
 
     return True
 
@@ -436,28 +956,19 @@ def auto_fill_form(page: Page, field_mapping: Dict[str, str]) -> Dict[str, bool]
         print(f"Email filled: {results['email']}")
         ```
     """
-    filler = SmartFormFiller()
     results = {}
 
     for field_type, value in field_mapping.items():
-        if field_type == 'email':
-            results[field_type] = filler.fill_email_field(page, value)
-        elif field_type == 'password':
-            results[field_type] = filler.fill_password_fields(page, value)
-        elif 'name' in field_type.lower():
-            results[field_type] = filler.fill_name_field(page, value)
-        elif 'phone' in field_type.lower():
-            results[field_type] = filler.fill_phone_field(page, value)
-        elif 'date' in field_type.lower():
-            hint = field_type.replace('date_of_', '').replace('_', ' ')
-            results[field_type] = filler.fill_date_field(page, value, field_hint=hint)
+        handler = _field_handler(field_type)
+        if handler:
+            results[field_type] = handler(page, value)
         else:
             # Try generic fill
             try:
                 field = page.locator(f'input[name="{field_type}"]').first
-                field.fill(value)
+                field.fill(value, timeout=_FILL_TIMEOUT)
                 results[field_type] = True
-            except:
+            except PlaywrightError:
                 results[field_type] = False
 
     return results
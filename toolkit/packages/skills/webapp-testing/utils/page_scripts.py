@@ -0,0 +1,44 @@
+"""
+In-Page Script Helpers
+
+Shared JavaScript for the scripts the helpers pass to page.evaluate() and
+page.wait_for_function(), so visibility checks and value setting behave the
+same everywhere.
+
+Usage:
+    from utils.page_scripts import page_function
+
+    FIRST_VISIBLE_JS = page_function('selector', '''
+        return [...document.querySelectorAll(selector)].some(visible);
+    ''')
+"""
+
+# Helpers available to every script built with page_function():
+# - visible(el): checkVisibility() is cheaper than computed-style checks;
+#   offsetParent covers older engines
+# - setNativeValue(el, value): goes through the native HTMLInputElement
+#   setter and fires input/change, so React-style controlled inputs notice
+JS_PRELUDE = """
+    const visible = el => el.checkVisibility
+        ? el.checkVisibility({checkOpacity: true, checkVisibilityCSS: true})
+        : el.offsetParent !== null;
+    const setNativeValue = (el, value) => {
+        Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set.call(el, value);
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+    };
+"""
+
+
+def page_function(params: str, body: str) -> str:
+    """
+    Build a JS function expression with JS_PRELUDE in scope.
+
+    Args:
+        params: Parameter list, e.g. 'selector' or '[value, confirm]'
+        body: Function body; may use visible() and setNativeValue()
+
+    Returns:
+        Source for page.evaluate() / page.wait_for_function()
+    """
+    return f"({params}) => {{{JS_PRELUDE}{body}}}"
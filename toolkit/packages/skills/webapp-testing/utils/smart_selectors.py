@@ -4,6 +4,9 @@ Smart Selector Strategies for Robust Web Testing
 Automatically tries multiple selector strategies to find elements,
 reducing test brittleness when HTML structure changes.
 
+Progress is reported through the "utils.smart_selectors" logger; configure
+logging (e.g. logging.basicConfig(level=logging.INFO)) to see it.
+
 Usage:
     from utils.smart_selectors import SelectorStrategies
 
@@ -14,16 +17,305 @@ Usage:
     SelectorStrategies.smart_click(page, 'Sign In')
 """
 
-from typing import Optional, List
-from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, List, Tuple
+from urllib.parse import urlsplit
+from playwright.sync_api import Page, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from utils.page_scripts import page_function
+
+
+log = logging.getLogger(__name__)
+
+
+def _level(verbose: bool) -> int:
+    """Progress messages go to INFO when verbose, otherwise DEBUG."""
+    return logging.INFO if verbose else logging.DEBUG
+
+
+# Winning input strategy per (origin, field_type), tried first on later lookups
+_SELECTOR_CACHE: Dict[Tuple[str, str], tuple] = {}
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _union(selectors: Iterable[str]) -> str:
+    """
+    Join selectors into one Playwright selector for the first visible match.
+
+    One union query is a single querySelectorAll in the browser, instead of
+    one round-trip (and visibility wait) per selector.
+    """
+    return f"{', '.join(selectors)} >> visible=true >> nth=0"
+
+
+# Playwright-only syntax that can't be comma-joined into one CSS union:
+# engine prefixes (text=, xpath=, role=), chaining (>>), XPath and quoted text
+# selectors, and Playwright pseudo-classes such as :has-text()
+_NON_CSS = re.compile(
+    r'^\s*(\w[\w-]*=|//|\.\.|["\'])|>>'
+    r'|:(has-text|text|text-is|text-matches|visible|nth-match|left-of|right-of|above|below|near)\b'
+)
+
+
+def _is_plain_css(selector: str) -> bool:
+    return not _NON_CSS.search(selector)
+
+
+@lru_cache(maxsize=128)
+def _plan(groups: tuple) -> tuple:
+    """
+    Pre-join the union selectors for a priority lookup (cached per strategy set).
+
+    Args:
+        groups: ((group_name, ((selector, strategy_name), ...)), ...) in priority order
+
+    Returns:
+        (union of every strategy, ((group_name, group_union, strategies), ...))
+    """
+    everything = _union(selector for _, group in groups for selector, _ in group)
+    return everything, tuple(
+        (group_name, _union(selector for selector, _ in group), group)
+        for group_name, group in groups
+    )
+
+
+# Returns 1 + the index of the first strategy with a visible match, else 0.
+# Each strategy is [css, text]: text (lowercase) must appear in the element's
+# text, standing in for Playwright-only pseudo-classes like :has-text().
+_FIRST_MATCH_JS = page_function('strategies', """
+    const text = el => (el.textContent || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+    for (let i = 0; i < strategies.length; i++) {
+        const [css, needle] = strategies[i];
+        for (const el of document.querySelectorAll(css)) {
+            if (needle && !text(el).includes(needle)) continue;
+            if (visible(el)) return i + 1;
+        }
+    }
+    return 0;
+""")
+
+# Scores the first visible match of every input strategy against the field
+# type and returns 1 + the index of the best one (ties go to the earlier
+# strategy), else 0. Hidden elements never score: they fail checkVisibility.
+_BEST_INPUT_JS = page_function('[strategies, fieldType]', """
+    const has = (el, attr) => (el.getAttribute(attr) || '').toLowerCase().includes(fieldType);
+    const score = el => {
+        let s = 0;
+        if (has(el, 'data-testid')) s += 3;
+        if (has(el, 'aria-label')) s += 2;
+        if ((el.getAttribute('type') || '').toLowerCase() === fieldType) s += 2;
+        if (has(el, 'name')) s += 1;
+        if (has(el, 'id')) s += 1;
+        // Placeholder-only matches are often hints ("Confirm your password")
+        if (s === 0 && has(el, 'placeholder')) s -= 1;
+        return s;
+    };
+
+    let best = 0, bestScore = -Infinity;
+    strategies.forEach(([css], i) => {
+        const el = [...document.querySelectorAll(css)].find(visible);
+        if (!el) return;
+        const s = score(el);
+        if (s > bestScore) {
+            best = i + 1;
+            bestScore = s;
+        }
+    });
+    return best;
+""")
+
+
+# How long each input strategy deserves to wait on its own (ms). A test ID or
+# exact id is either on the page almost at once or not at all; looser
+# attribute matches get more time. find_input_field gives a strategy cached
+# for the origin this long before scoring every strategy for the rest of the
+# caller's timeout.
+_STRATEGY_BUDGET_MS = {
+    'data-testid': 100,
+    'aria-label': 200,
+    'placeholder': 300,
+    'name attribute': 300,
+    'type attribute': 500,
+    'id (exact)': 100,
+    'id (partial)': 500,
+}
+
+
+@lru_cache(maxsize=64)
+def _input_strategies(field_type: str) -> tuple:
+    """Input-field strategies for field_type as (selector, name, css, text) tuples."""
+    strategies = (
+        # Strategy 1: Test IDs (most reliable)
+        (f'[data-testid*="{field_type}" i]', 'data-testid'),
+
+        # Strategy 2: ARIA labels (accessibility best practice)
+        (f'input[aria-label*="{field_type}" i]', 'aria-label'),
+
+        # Strategy 3: Placeholder text
+        (f'input[placeholder*="{field_type}" i]', 'placeholder'),
+
+        # Strategy 4: Name attribute
+        (f'input[name*="{field_type}" i]', 'name attribute'),
+
+        # Strategy 5: Type attribute (works for email, password, text)
+        (f'input[type="{field_type}"]', 'type attribute'),
+
+        # Strategy 6: ID attribute (exact match)
+        (f'#{field_type}', 'id (exact)'),
+
+        # Strategy 7: ID attribute (partial match)
+        (f'input[id*="{field_type}" i]', 'id (partial)'),
+    )
+
+    # '#first name' is not valid CSS and would make querySelectorAll throw
+    if not re.fullmatch(r'[\w-]+', field_type):
+        strategies = tuple(s for s in strategies if s[1] != 'id (exact)')
+
+    return tuple((selector, name, selector, None) for selector, name in strategies)
+
+
+@lru_cache(maxsize=128)
+def _button_strategies(button_text: str) -> tuple:
+    """Button strategies for button_text as (selector, name, css, text) tuples."""
+    # Normalize button text for test-id matching
+    test_id = button_text.lower().replace(' ', '-')
+    text = button_text.lower()
+    # text-matches takes a regex; escape it so 'Save (draft)' matches literally,
+    # then escape again for the quoted selector string
+    pattern = re.escape(button_text).replace('\\', '\\\\').replace('"', '\\"')
+
+    # (Playwright selector, name, CSS for the in-page check, required text)
+    return (
+        # Strategy 1: Test IDs
+        (f'[data-testid*="{test_id}" i]', 'data-testid', f'[data-testid*="{test_id}" i]', None),
+
+        # Strategy 2: Button with name attribute
+        (f'button[name*="{button_text}" i]', 'button name', f'button[name*="{button_text}" i]', None),
+
+        # Strategy 3: Exact text match
+        (f'button:has-text("{button_text}")', 'exact text', 'button', text),
+
+        # Strategy 4: Case-insensitive text match
+        (f'button:text-matches("{pattern}", "i")', 'case-insensitive text', 'button', text),
+
+        # Strategy 5: Link styled as button
+        (f'a:has-text("{button_text}")', 'link (exact text)', 'a', text),
+
+        # Strategy 6: Link case-insensitive
+        (f'a:text-matches("{pattern}", "i")', 'link (case-insensitive)', 'a', text),
+
+        # Strategy 7: Input submit button
+        (f'input[type="submit"][value*="{button_text}" i]', 'submit input',
+         f'input[type="submit"][value*="{button_text}" i]', None),
+
+        # Strategy 8: Any clickable element with text
+        (f'[role="button"]:has-text("{button_text}")', 'role=button', '[role="button"]', text),
+    )
+
+
+def _first_match(
+    page: Page,
+    strategies: tuple,
+    timeout: int,
+    field_type: Optional[str] = None
+) -> Optional[tuple]:
+    """
+    Evaluate every strategy in one browser-side pass and return the winner.
+
+    The check runs inside wait_for_function, so it is re-polled in the page
+    until a strategy matches or the timeout expires - no round-trip per
+    strategy.
+
+    Args:
+        page: Playwright Page object
+        strategies: (selector, name, css, text) tuples in priority order
+        timeout: Maximum time to wait for any match (milliseconds)
+        field_type: If given, score input candidates against it instead of
+            taking the first strategy that matches
+
+    Returns:
+        The winning (selector, name, css, text) tuple, or None
+    """
+    queries = [[css, text] for _, _, css, text in strategies]
+    if field_type:
+        script, arg = _BEST_INPUT_JS, [queries, field_type.lower()]
+    else:
+        script, arg = _FIRST_MATCH_JS, queries
+
+    try:
+        handle = page.wait_for_function(script, arg=arg, timeout=timeout)
+    except PlaywrightTimeoutError:
+        return None
+    except PlaywrightError:
+        # Invalid selector, page closed, etc.
+        return None
+
+    return strategies[handle.json_value() - 1]
+
+
+def _find_by_priority(page: Page, plan: tuple, timeout: int) -> Optional[tuple]:
+    """
+    Wait once for any strategy to match, then pick the best priority group.
+
+    Args:
+        page: Playwright Page object
+        plan: Result of _plan() for the strategies to try
+        timeout: Maximum time to wait for any match (milliseconds)
+
+    Returns:
+        (union_selector, group_name, strategies) for the first group with a
+        visible match, or None
+
+    Raises:
+        PlaywrightError: If the union is not a valid selector, page closed, etc.
+    """
+    everything, groups = plan
+    try:
+        page.locator(everything).wait_for(state='visible', timeout=timeout)
+    except PlaywrightTimeoutError:
+        return None
+
+    for group_name, selector, group in groups:
+        if page.locator(selector).count():
+            return selector, group_name, group
+
+    return None
+
+
+def _first_visible(page: Page, selectors: List[str], timeout: int) -> Optional[str]:
+    """
+    Poll each selector in turn until one has a visible match.
+
+    Fallback for selectors that can't share a union. An invalid selector is
+    skipped rather than failing the whole lookup.
+    """
+    deadline = time.monotonic() + timeout / 1000
+    while True:
+        for selector in selectors:
+            try:
+                if page.locator(selector).first.is_visible():
+                    return selector
+            except PlaywrightError:
+                continue
+        if time.monotonic() >= deadline:
+            return None
+        page.wait_for_timeout(100)
 
 
 class SelectorStrategies:
     """Multiple strategies for finding common elements"""
 
-    # Reduced timeouts for faster failure (5s per strategy instead of default 30s)
-    DEFAULT_TIMEOUT = 5000  # 5 seconds per strategy attempt
+    # Reduced timeouts for faster failure (instead of the default 30s)
+    DEFAULT_TIMEOUT = 5000  # 5 seconds for any strategy to match
     MAX_TOTAL_TIMEOUT = 10000  # 10 seconds max across all strategies
+    FILL_TIMEOUT = 2000  # Field is already known visible when filled
 
     @staticmethod
     def find_input_field(
@@ -35,6 +327,15 @@ class SelectorStrategies:
         """
         Find input field using multiple strategies in order of reliability.
 
+        All strategies are checked in a single in-page pass. Each strategy's
+        first visible element is scored on how strongly it matches field_type
+        (test ID, ARIA label, type, name/id, placeholder only) and the best
+        one wins, with ties going to the earlier strategy. The returned
+        selector resolves to that element.
+        The winner is remembered per origin and tried first next time, alone,
+        for its budget in _STRATEGY_BUDGET_MS; the full pass gets whatever is
+        left of timeout.
+
         Strategies (in order):
         1. Test IDs: [data-testid*="field_type"]
         2. ARIA labels: input[aria-label*="field_type" i]
@@ -46,8 +347,8 @@ class SelectorStrategies:
         Args:
             page: Playwright Page object
             field_type: Type of field to find (e.g., 'email', 'password')
-            timeout: Timeout per strategy in milliseconds (default: 5000)
-            verbose: Print which strategy succeeded (default: True)
+            timeout: Overall timeout for any strategy to match in milliseconds (default: 5000)
+            verbose: Log which strategy succeeded at INFO rather than DEBUG (default: True)
 
         Returns:
             Selector string that worked, or None if not found
@@ -57,44 +358,29 @@ class SelectorStrategies:
             if selector:
                 page.fill(selector, 'test@example.com')
         """
-        strategies = [
-            # Strategy 1: Test IDs (most reliable)
-            (f'[data-testid*="{field_type}" i]', 'data-testid'),
-
-            # Strategy 2: ARIA labels (accessibility best practice)
-            (f'input[aria-label*="{field_type}" i]', 'aria-label'),
-
-            # Strategy 3: Placeholder text
-            (f'input[placeholder*="{field_type}" i]', 'placeholder'),
-
-            # Strategy 4: Name attribute
-            (f'input[name*="{field_type}" i]', 'name attribute'),
-
-            # Strategy 5: Type attribute (works for email, password, text)
-            (f'input[type="{field_type}"]', 'type attribute'),
-
-            # Strategy 6: ID attribute (exact match)
-            (f'#{field_type}', 'id (exact)'),
-
-            # Strategy 7: ID attribute (partial match)
-            (f'input[id*="{field_type}" i]', 'id (partial)'),
-        ]
-
-        for selector, strategy_name in strategies:
-            try:
-                locator = page.locator(selector).first
-                if locator.is_visible(timeout=timeout):
-                    if verbose:
-                        print(f"✓ Found field via {strategy_name}: {selector}")
-                    return selector
-            except PlaywrightTimeoutError:
-                continue
-            except Exception:
-                # Catch other errors (element not found, etc.)
-                continue
-
-        if verbose:
-            print(f"✗ Could not find field for '{field_type}' using any strategy")
+        key = (_origin(page.url), field_type)
+        strategies = _input_strategies(field_type)
+        deadline = time.monotonic() + timeout / 1000
+
+        # A strategy that already worked on this origin gets its budget first
+        found = None
+        cached = _SELECTOR_CACHE.get(key)
+        if cached:
+            found = _first_match(page, (cached,), max(1, min(_STRATEGY_BUDGET_MS.get(cached[1], 100), timeout)))
+
+        if not found:
+            # Playwright treats timeout=0 as "wait forever"
+            remaining = max(1, int((deadline - time.monotonic()) * 1000))
+            found = _first_match(page, strategies, remaining, field_type=field_type)
+
+        if found:
+            _SELECTOR_CACHE[key] = found
+            selector, strategy_name = _union([found[0]]), found[1]
+            log.log(_level(verbose), "✓ Found field via %s: %s", strategy_name, selector)
+            return selector
+
+        _SELECTOR_CACHE.pop(key, None)
+        log.log(_level(verbose), "✗ Could not find field for '%s' using any strategy", field_type)
         return None
 
     @staticmethod
@@ -105,7 +391,8 @@ class SelectorStrategies:
         verbose: bool = True
     ) -> Optional[str]:
         """
-        Find button by text using multiple strategies.
+        Find button by text using multiple strategies, checked in a single
+        in-page pass.
 
         Strategies:
         1. Test ID: [data-testid*="button-text"]
@@ -118,8 +405,8 @@ class SelectorStrategies:
         Args:
             page: Playwright Page object
             button_text: Text on the button
-            timeout: Timeout per strategy in milliseconds
-            verbose: Print which strategy succeeded
+            timeout: Timeout for any strategy to match in milliseconds
+            verbose: Log which strategy succeeded at INFO rather than DEBUG
 
         Returns:
             Selector string that worked, or None if not found
@@ -129,49 +416,13 @@ class SelectorStrategies:
             if selector:
                 page.click(selector)
         """
-        # Normalize button text for test-id matching
-        test_id = button_text.lower().replace(' ', '-')
-
-        strategies = [
-            # Strategy 1: Test IDs
-            (f'[data-testid*="{test_id}" i]', 'data-testid'),
-
-            # Strategy 2: Button with name attribute
-            (f'button[name*="{button_text}" i]', 'button name'),
-
-            # Strategy 3: Exact text match
-            (f'button:has-text("{button_text}")', 'exact text'),
-
-            # Strategy 4: Case-insensitive text match
-            (f'button:text-matches("{button_text}", "i")', 'case-insensitive text'),
-
-            # Strategy 5: Link styled as button
-            (f'a:has-text("{button_text}")', 'link (exact text)'),
-
-            # Strategy 6: Link case-insensitive
-            (f'a:text-matches("{button_text}", "i")', 'link (case-insensitive)'),
-
-            # Strategy 7: Input submit button
-            (f'input[type="submit"][value*="{button_text}" i]', 'submit input'),
+        found = _first_match(page, _button_strategies(button_text), timeout)
+        if found:
+            selector, strategy_name = _union([found[0]]), found[1]
+            log.log(_level(verbose), "✓ Found button via %s: %s", strategy_name, selector)
+            return selector
 
-            # Strategy 8: Any clickable element with text
-            (f'[role="button"]:has-text("{button_text}")', 'role=button'),
-        ]
-
-        for selector, strategy_name in strategies:
-            try:
-                locator = page.locator(selector).first
-                if locator.is_visible(timeout=timeout):
-                    if verbose:
-                        print(f"✓ Found button via {strategy_name}: {selector}")
-                    return selector
-            except PlaywrightTimeoutError:
-                continue
-            except Exception:
-                continue
-
-        if verbose:
-            print(f"✗ Could not find button '{button_text}' using any strategy")
+        log.log(_level(verbose), "✗ Could not find button '%s' using any strategy", button_text)
         return None
 
     @staticmethod
@@ -190,7 +441,7 @@ class SelectorStrategies:
             field_type: Type of field (e.g., 'email', 'password', 'username')
             value: Value to fill
             timeout: Max timeout across all strategies
-            verbose: Print progress messages
+            verbose: Log progress at INFO rather than DEBUG
 
         Returns:
             True if successful, False otherwise
@@ -206,13 +457,11 @@ class SelectorStrategies:
 
         if selector:
             try:
-                page.fill(selector, value)
-                if verbose:
-                    print(f"✓ Filled '{field_type}' with value")
+                page.fill(selector, value, timeout=SelectorStrategies.FILL_TIMEOUT)
+                log.log(_level(verbose), "✓ Filled '%s' with value", field_type)
                 return True
-            except Exception as e:
-                if verbose:
-                    print(f"✗ Found field but failed to fill: {e}")
+            except PlaywrightError as e:
+                log.log(_level(verbose), "✗ Found field but failed to fill: %s", e)
                 return False
 
         return False
@@ -231,7 +480,7 @@ class SelectorStrategies:
             page: Playwright Page object
             button_text: Text on the button to click
             timeout: Max timeout across all strategies
-            verbose: Print progress messages
+            verbose: Log progress at INFO rather than DEBUG
 
         Returns:
             True if successful, False otherwise
@@ -248,12 +497,10 @@ class SelectorStrategies:
         if selector:
             try:
                 page.click(selector)
-                if verbose:
-                    print(f"✓ Clicked '{button_text}' button")
+                log.log(_level(verbose), "✓ Clicked '%s' button", button_text)
                 return True
-            except Exception as e:
-                if verbose:
-                    print(f"✗ Found button but failed to click: {e}")
+            except PlaywrightError as e:
+                log.log(_level(verbose), "✗ Found button but failed to click: %s", e)
                 return False
 
         return False
@@ -270,11 +517,16 @@ class SelectorStrategies:
 
         Useful when you have specific selectors to try but want fallback logic.
 
+        Plain CSS selectors are comma-joined into one union and matched with a
+        single wait. If any selector uses Playwright-only syntax (text=,
+        xpath=, >>, :has-text()) or the union is rejected, each selector is
+        polled on its own instead, so one bad selector can't sink the lookup.
+
         Args:
             page: Playwright Page object
-            selectors: List of CSS selectors to try
-            timeout: Timeout per selector
-            verbose: Print which selector worked
+            selectors: List of selectors to try, in priority order
+            timeout: Timeout for any selector to match
+            verbose: Log which selector worked at INFO rather than DEBUG
 
         Returns:
             First selector that found a visible element, or None
@@ -289,18 +541,21 @@ class SelectorStrategies:
             if selector:
                 page.click(selector)
         """
-        for selector in selectors:
+        if all(_is_plain_css(s) for s in selectors):
+            # Each selector is its own priority group: one wait, then cheap probes
             try:
-                locator = page.locator(selector).first
-                if locator.is_visible(timeout=timeout):
-                    if verbose:
-                        print(f"✓ Found element: {selector}")
-                    return selector
-            except PlaywrightTimeoutError:
-                continue
-            except Exception:
-                continue
+                found = _find_by_priority(
+                    page, _plan(tuple((s, ((s, s),)) for s in selectors)), timeout
+                )
+                selector = found[1] if found else None
+            except PlaywrightError:
+                selector = _first_visible(page, selectors, timeout)
+        else:
+            selector = _first_visible(page, selectors, timeout)
+
+        if selector:
+            log.log(_level(verbose), "✓ Found element: %s", selector)
+            return selector
 
-        if verbose:
-            print(f"✗ Could not find element using any of {len(selectors)} selectors")
+        log.log(_level(verbose), "✗ Could not find element using any of %s selectors", len(selectors))
         return None
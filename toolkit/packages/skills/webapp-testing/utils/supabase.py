@@ -7,9 +7,20 @@ Supports user management, email verification, and test data cleanup.
 
 import subprocess
 import json
+import time
 from typing import Dict, List, Optional, Any
 
 
+# Tables cleaned by default when removing a test user
+DEFAULT_CLEANUP_TABLES = [
+    'pending_profiles',
+    'coach_verification_requests',
+    'team_members',
+    'team_join_requests',
+    'profiles'
+]
+
+
 class SupabaseTestClient:
     """
     Generic Supabase test client for database operations during testing.
@@ -231,13 +242,7 @@ class SupabaseTestClient:
             ```
         """
         if not tables:
-            tables = [
-                'pending_profiles',
-                'coach_verification_requests',
-                'team_members',
-                'team_join_requests',
-                'profiles'
-            ]
+            tables = DEFAULT_CLEANUP_TABLES
 
         results = {}
 
@@ -275,6 +280,86 @@ class SupabaseTestClient:
         result = self._run_sql(sql)
         return result['success']
 
+    @staticmethod
+    def _remove_user_sql(user_filter: str, tables: List[str] = None) -> str:
+        """
+        Build a DO block that deletes one auth user and their related records.
+
+        Each table delete runs in its own sub-block so a missing table is
+        skipped. Tables without a user_id column (e.g. profiles) fall back to
+        matching on id. The auth.users delete is not guarded: if it fails the
+        whole statement rolls back and psql exits non-zero.
+
+        Args:
+            user_filter: WHERE clause selecting the user in auth.users
+            tables: Related tables to clean (defaults to DEFAULT_CLEANUP_TABLES)
+        """
+        deletes = "\n".join(
+            f"          BEGIN DELETE FROM public.{table} WHERE user_id = uid; "
+            f"EXCEPTION WHEN undefined_column THEN "
+            f"BEGIN DELETE FROM public.{table} WHERE id = uid; EXCEPTION WHEN OTHERS THEN NULL; END; "
+            f"WHEN OTHERS THEN NULL; END;"
+            for table in (tables or DEFAULT_CLEANUP_TABLES)
+        )
+        return f"""
+        DO $$
+        DECLARE uid uuid;
+        BEGIN
+          SELECT id INTO uid FROM auth.users WHERE {user_filter};
+          IF uid IS NULL THEN RETURN; END IF;
+{deletes}
+          DELETE FROM auth.users WHERE id = uid;
+        END $$;
+        """
+
+    def setup_test_user(self, email: str, invite_code: str, code_type: str = 'general',
+                        max_uses: int = 999, tables: List[str] = None) -> bool:
+        """
+        Prepare for a registration test in a single database round-trip.
+
+        Creates (or resets) the invite code and removes any existing user with
+        this email, including related records, in one transaction. If the
+        user can't be deleted nothing is applied and False is returned.
+
+        Args:
+            email: Email the test will register
+            invite_code: Invite code to create
+            code_type: Type of code (e.g., 'general', 'team_join')
+            max_uses: Maximum number of uses
+            tables: Related tables to clean (defaults to DEFAULT_CLEANUP_TABLES)
+
+        Returns:
+            True if successful, False otherwise
+
+        Example:
+            ```python
+            client.setup_test_user("test@example.com", "TEST2024")
+            ```
+        """
+        sql = f"""
+        INSERT INTO public.invite_codes (code, code_type, is_valid, max_uses, expires_at)
+        VALUES ('{invite_code}', '{code_type}', true, {max_uses}, NOW() + INTERVAL '30 days')
+        ON CONFLICT (code) DO UPDATE SET is_valid=true, max_uses={max_uses}, use_count=0;
+        {self._remove_user_sql(f"email = '{email}'", tables)}
+        """
+
+        result = self._run_sql(sql)
+        return result['success']
+
+    def teardown_test_user(self, user_id: str, tables: List[str] = None) -> bool:
+        """
+        Delete a test user and related records in a single database round-trip.
+
+        Args:
+            user_id: User ID
+            tables: Related tables to clean (defaults to DEFAULT_CLEANUP_TABLES)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        result = self._run_sql(self._remove_user_sql(f"id = '{user_id}'", tables))
+        return result['success']
+
     def find_user_by_email(self, email: str) -> Optional[str]:
         """
         Find user ID by email address.
@@ -292,6 +377,35 @@ class SupabaseTestClient:
             return result['output'].strip()
         return None
 
+    def wait_for_user_by_email(self, email: str, timeout_s: float = 10) -> Optional[str]:
+        """
+        Poll for a user by email with exponential backoff.
+
+        Use after a UI registration instead of a fixed sleep: returns as soon
+        as the row exists, and tolerates slow backends up to timeout_s.
+
+        Args:
+            email: User email
+            timeout_s: Maximum time to wait in seconds
+
+        Returns:
+            User ID if found within the timeout, None otherwise
+        """
+        start = time.monotonic()
+        delay = 0.1
+
+        while True:
+            user_id = self.find_user_by_email(email)
+            if user_id:
+                return user_id
+
+            remaining = timeout_s - (time.monotonic() - start)
+            if remaining <= 0:
+                return None
+
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 1.5, 1.0)
+
     def get_user_privileges(self, user_id: str) -> Optional[List[str]]:
         """
         Get user's privilege array.
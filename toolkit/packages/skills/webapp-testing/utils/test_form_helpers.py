@@ -0,0 +1,55 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "pytest>=7.0.0",
+#     "playwright",
+# ]
+# ///
+
+# ABOUTME: Tests for how form_helpers resolves step field keys to fill handlers
+# Pure lookups only - no browser is launched
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make utils/ importable as a package, the way the skill's scripts import it
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.form_helpers import _field_handler, _field_key, _plan_step
+
+
+class TestFieldKeys:
+    """Test field keys resolve to the right fill handler kind."""
+
+    @pytest.mark.parametrize("field_type, kind", [
+        ("email", "email"),
+        ("full_name", "full_name"),
+        ("name", "name"),
+        ("first_name", "name"),
+        ("lastname", "name"),
+        ("mobile_phone", "phone"),
+        ("date_of_birth", "date"),
+    ])
+    def test_known_keys_resolve(self, field_type, kind):
+        assert _field_key(field_type) == kind
+        assert _field_handler(field_type) is not None
+
+    @pytest.mark.parametrize("field_type", ["username", "company_name", "zip"])
+    def test_name_like_keys_are_not_names(self, field_type):
+        """username/company_name must not be split into first and last names."""
+        assert _field_key(field_type) is None
+        assert _field_handler(field_type) is None
+
+    def test_step_plan_reports_unknown_fields(self):
+        plan = _plan_step([{'fields': {'username': 'jdoe', 'full_name': 'J Doe'}}], 0, "CONTINUE")
+
+        assert plan['unknown'] == ['username']
+        assert [field_type for field_type, _, _ in plan['fields']] == ['full_name']
+
+
+if __name__ == "__main__":
+    # Run tests if executed directly
+    pytest.main([__file__] + sys.argv[1:])
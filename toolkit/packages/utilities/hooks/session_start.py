@@ -3,17 +3,24 @@
 # requires-python = ">=3.11"
 # dependencies = [
 #     "python-dotenv",
+#     "orjson",
 # ]
 # ///
 
 import argparse
+import hashlib
 import json
 import os
+import shutil
 import sys
 import subprocess
+import threading
+import time
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, List, Dict
+from functools import lru_cache
+from typing import Optional, List, Dict, FrozenSet
 
 try:
     from dotenv import load_dotenv
@@ -21,6 +28,124 @@ try:
 except ImportError:
     pass  # dotenv is optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the stdlib json module
+
+
+def _loads(data):
+    """Parse JSON from bytes or str."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _dumps(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+# Results reused across SessionStart runs fired in quick succession
+# (resume, clear, new shells). Entries are keyed per working directory.
+CACHE_FILE = Path.home() / ".claude" / "cache" / "session_start_cache.json"
+CACHE_TTL_SECONDS = 3
+
+# Rule drawn above and below the active sessions table
+_TABLE_SEP = "═" * 63
+
+_cache_lock = threading.Lock()
+_tmux_lock = threading.Lock()
+
+
+def _read_cache() -> Dict:
+    try:
+        with open(CACHE_FILE, 'rb') as f:
+            return _loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+
+def _cached_or_compute(key: str, ttl: float, fn):
+    """
+    Return fn()'s result, reusing a value cached less than ttl seconds ago.
+
+    The cache is a small JSON file rewritten atomically via os.replace, so
+    concurrent hook runs never see a partial file.
+    """
+    cwd_hash = hashlib.sha1(os.getcwd().encode()).hexdigest()[:12]
+    cache_key = f"{cwd_hash}:{key}"
+
+    with _cache_lock:
+        entry = _read_cache().get(cache_key)
+    if entry and time.time() - entry["time"] < ttl:
+        return entry["value"]
+
+    value = fn()
+
+    with _cache_lock:
+        try:
+            now = time.time()
+            cache = {k: v for k, v in _read_cache().items() if now - v["time"] < ttl}
+            cache[cache_key] = {"time": now, "value": value}
+            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, 'wb') as f:
+                f.write(_dumps(cache))
+            os.replace(tmp_file, CACHE_FILE)
+        except (OSError, TypeError, KeyError):
+            pass  # Caching is best effort
+
+    return value
+
+
+@lru_cache(maxsize=None)
+def _which(tool: str) -> Optional[str]:
+    """Path to an executable on PATH, looked up once per process."""
+    return shutil.which(tool)
+
+
+def live_tmux_sessions() -> Optional[FrozenSet[str]]:
+    """
+    Names of running tmux sessions, from a single `tmux list-sessions` call.
+
+    Cached so every check in one hook run shares the same call, even from
+    different threads. Returns an empty set when no tmux server is
+    running, and None when tmux is not available (liveness unknown).
+    """
+    with _tmux_lock:
+        return _list_tmux_sessions()
+
+
+@lru_cache(maxsize=1)
+def _list_tmux_sessions() -> Optional[FrozenSet[str]]:
+    if not _which('tmux'):
+        return None
+
+    try:
+        result = subprocess.run(
+            ['tmux', 'list-sessions', '-F', '#{session_name}'],
+            capture_output=True,
+            text=True,
+            timeout=2
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+
+    if result.returncode != 0:
+        return frozenset()  # No server running
+    return frozenset(result.stdout.splitlines())
+
+
+def format_age(seconds: float) -> str:
+    """Render an age in seconds as '5m ago', '3h ago' or '2d ago'."""
+    hours = seconds / 3600
+    if hours < 1:
+        return f"{int(seconds / 60)}m ago"
+    if hours < 24:
+        return f"{int(hours)}h ago"
+    return f"{int(hours / 24)}d ago"
+
 
 def check_orphaned_agent_sessions() -> List[Dict]:
     """
@@ -37,15 +162,26 @@ def check_orphaned_agent_sessions() -> List[Dict]:
     agents_dir = Path.home() / ".claude" / "agents"
     orphaned = []
 
-    if not agents_dir.exists():
+    # Without tmux there is no way to tell live sessions from dead ones
+    if not agents_dir.exists() or not _which('tmux'):
         return orphaned
 
-    for meta_file in agents_dir.glob("*.json"):
-        if meta_file.name == "registry.jsonl":
-            continue
+    with os.scandir(agents_dir) as entries:
+        meta_files = [(entry.path, entry.stat().st_mtime) for entry in entries
+                      if entry.name.endswith('.json') and entry.is_file()]
+    if not meta_files:
+        return orphaned
 
+    live = live_tmux_sessions()
+    if live is None:
+        # tmux timed out - can't check
+        return orphaned
+
+    now_ts = time.time()
+    for meta_file, mtime in meta_files:
         try:
-            meta = json.loads(meta_file.read_text())
+            with open(meta_file, 'rb') as f:
+                meta = _loads(f.read())
         except (json.JSONDecodeError, IOError):
             continue
 
@@ -56,18 +192,8 @@ def check_orphaned_agent_sessions() -> List[Dict]:
         if status in ("completed", "archived"):
             continue
 
-        # Check if tmux session exists
-        try:
-            result = subprocess.run(
-                ["tmux", "has-session", "-t", session],
-                capture_output=True,
-                timeout=2
-            )
-            if result.returncode == 0:
-                continue  # Session is alive, not orphaned
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            # tmux not available or timed out - can't check
-            continue
+        if session in live:
+            continue  # Session is alive, not orphaned
 
         # tmux session dead - check if worktree exists
         worktree = meta.get("directory", "")
@@ -76,22 +202,15 @@ def check_orphaned_agent_sessions() -> List[Dict]:
             transcript = meta.get("transcript_path", "")
             can_resume = transcript and Path(transcript).exists()
 
-            # Calculate time since creation
+            # Calculate time since creation, falling back to the file's mtime
             created = meta.get("created", "")
-            time_ago = ""
+            created_ts = mtime
             if created:
                 try:
-                    created_dt = datetime.fromisoformat(created.replace('Z', '+00:00'))
-                    delta = datetime.now(created_dt.tzinfo) - created_dt
-                    hours = delta.total_seconds() / 3600
-                    if hours < 1:
-                        time_ago = f"{int(delta.total_seconds() / 60)}m ago"
-                    elif hours < 24:
-                        time_ago = f"{int(hours)}h ago"
-                    else:
-                        time_ago = f"{int(hours / 24)}d ago"
-                except (ValueError, TypeError):
+                    created_ts = datetime.fromisoformat(created.replace('Z', '+00:00')).timestamp()
+                except (ValueError, TypeError, AttributeError):
                     pass
+            time_ago = format_age(now_ts - created_ts)
 
             orphaned.append({
                 "session": session,
@@ -138,68 +257,129 @@ def format_orphan_warning(orphaned: List[Dict]) -> Optional[str]:
 
 
 def log_session_start(input_data):
-    """Log session start event to logs directory."""
-    # Ensure logs directory exists
+    """Append the session start event to logs/session_start.jsonl (one JSON object per line)."""
     log_dir = Path("logs")
     log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / 'session_start.json'
-    
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, 'r') as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
-    
-    # Append the entire input data
-    log_data.append(input_data)
-    
-    # Write back to file with formatting
-    with open(log_file, 'w') as f:
-        json.dump(log_data, f, indent=2)
 
+    # Append-only: no need to read back and rewrite the whole history
+    with open(log_dir / 'session_start.jsonl', 'ab') as f:
+        f.write(_dumps(input_data) + b'\n')
 
-def get_git_status():
-    """Get current git status information."""
+
+def read_session_start_log(log_dir: Path = Path("logs")):
+    """
+    Stream logged session start events, oldest first.
+
+    Yields entries from a legacy session_start.json array (written by older
+    versions of this hook) before those in session_start.jsonl.
+    """
+    legacy = log_dir / 'session_start.json'
     try:
-        # Get current branch
-        branch_result = subprocess.run(
-            ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        current_branch = branch_result.stdout.strip() if branch_result.returncode == 0 else "unknown"
-        
-        # Get uncommitted changes count
-        status_result = subprocess.run(
-            ['git', 'status', '--porcelain'],
+        with open(legacy, 'rb') as f:
+            yield from _loads(f.read())
+    except (FileNotFoundError, json.JSONDecodeError, ValueError):
+        pass
+
+    try:
+        with open(log_dir / 'session_start.jsonl', 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield _loads(line)
+    except FileNotFoundError:
+        pass
+
+
+def parse_porcelain_v2(output: str) -> Dict:
+    """
+    Parse `git status --porcelain=2 --branch` output.
+
+    Returns a dict with the branch, upstream and ahead/behind counts from the
+    `# branch.*` headers, plus the changed entries rewritten in
+    `git status --short` form.
+    """
+    status = {"branch": "unknown", "upstream": None, "ahead": 0, "behind": 0, "changes": []}
+
+    for line in output.splitlines():
+        if line.startswith('# branch.head '):
+            status["branch"] = line[len('# branch.head '):]
+        elif line.startswith('# branch.upstream '):
+            status["upstream"] = line[len('# branch.upstream '):]
+        elif line.startswith('# branch.ab '):
+            ahead, behind = line[len('# branch.ab '):].split()
+            status["ahead"], status["behind"] = int(ahead), -int(behind)
+        elif line.startswith('1 '):
+            fields = line.split(' ', 8)
+            status["changes"].append(f"{fields[1].replace('.', ' ')} {fields[8]}")
+        elif line.startswith('2 '):
+            fields = line.split(' ', 9)
+            path, orig_path = fields[9].split('\t', 1)
+            status["changes"].append(f"{fields[1].replace('.', ' ')} {orig_path} -> {path}")
+        elif line.startswith('u '):
+            fields = line.split(' ', 10)
+            status["changes"].append(f"{fields[1]} {fields[10]}")
+        elif line.startswith('? '):
+            status["changes"].append(f"?? {line[2:]}")
+
+    return status
+
+
+def run_git_status() -> Optional[Dict]:
+    """
+    Run git status once and parse it.
+
+    Branch, upstream and changes all come from a single
+    `git status --porcelain=2 --branch` call. Returns None outside a git
+    repository or when git is unavailable.
+    """
+    try:
+        result = subprocess.run(
+            ['git', '-c', 'core.untrackedCache=true', 'status', '--porcelain=2', '--branch'],
             capture_output=True,
             text=True,
-            timeout=5
+            timeout=10
         )
-        if status_result.returncode == 0:
-            changes = status_result.stdout.strip().split('\n') if status_result.stdout.strip() else []
-            uncommitted_count = len(changes)
-        else:
-            uncommitted_count = 0
-        
-        return current_branch, uncommitted_count
-    except Exception:
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+
+    if result.returncode != 0:
+        return None
+    return parse_porcelain_v2(result.stdout)
+
+
+def format_git_status(status: Dict) -> List[str]:
+    """Render parsed status as the `Git Status` and `Changes Summary` blocks."""
+    header = f"## {status['branch']}"
+    if status["upstream"]:
+        header += f"...{status['upstream']}"
+        tracking = []
+        if status["ahead"]:
+            tracking.append(f"ahead {status['ahead']}")
+        if status["behind"]:
+            tracking.append(f"behind {status['behind']}")
+        if tracking:
+            header += f" [{', '.join(tracking)}]"
+
+    blocks = ["Git Status:\n" + "\n".join([header] + status["changes"])]
+    if status["changes"]:
+        blocks.append("Changes Summary:\n" + "\n".join(status["changes"]))
+    return blocks
+
+
+def get_git_status():
+    """Get current git status information."""
+    status = run_git_status()
+    if status is None:
         return None, None
+    return status["branch"], len(status["changes"])
 
 
 def get_recent_issues():
     """Get recent GitHub issues if gh CLI is available."""
     try:
         # Check if gh is available
-        gh_check = subprocess.run(['which', 'gh'], capture_output=True)
-        if gh_check.returncode != 0:
+        if not _which('gh'):
             return None
-        
+
         # Get recent open issues
         result = subprocess.run(
             ['gh', 'issue', 'list', '--limit', '5', '--state', 'open'],
@@ -238,15 +418,16 @@ def load_development_context(source):
     ]
     
     for file_path in context_files:
-        if Path(file_path).exists():
-            try:
-                with open(file_path, 'r') as f:
-                    content = f.read().strip()
-                    if content:
-                        context_parts.append(f"\n--- Content from {file_path} ---")
-                        context_parts.append(content[:1000])  # Limit to first 1000 chars
-            except Exception:
-                pass
+        # Just try to open it: one syscall for a missing file instead of stat + open
+        try:
+            with open(file_path, 'r') as f:
+                content = f.read(1024).strip()  # Only the head is shown, don't read it all
+        except (OSError, UnicodeDecodeError):
+            continue
+
+        if content:
+            context_parts.append(f"\n--- Content from {file_path} ---")
+            context_parts.append(content[:1000])  # Limit to first 1000 chars
     
     # Add recent issues if available
     issues = get_recent_issues()
@@ -260,32 +441,33 @@ def load_development_context(source):
 def load_tmux_sessions():
     """Load and display active tmux development sessions."""
     try:
-        # Find all tmux session metadata files
-        session_files = list(Path.cwd().glob('.tmux-*-session.json'))
+        # Find all tmux session metadata files (.tmux-<type>-session.json)
+        with os.scandir('.') as entries:
+            session_files = [entry for entry in entries
+                             if entry.name.startswith('.tmux-')
+                             and entry.name.endswith('-session.json')
+                             and entry.is_file()]
 
         if not session_files:
             return "📋 No active development sessions found"
 
+        # One tmux call covers every file; with no live sessions nothing needs reading
+        live = live_tmux_sessions()
+        if not live:
+            return "📋 No active development sessions found"
+
         sessions = []
         for file in session_files:
             try:
-                with open(file, 'r') as f:
-                    data = json.load(f)
+                with open(file.path, 'rb') as f:
+                    data = _loads(f.read())
 
                     # Verify session still exists
-                    session_name = data.get('session')
-                    if session_name:
-                        check_result = subprocess.run(
-                            ['tmux', 'has-session', '-t', session_name],
-                            capture_output=True,
-                            timeout=2
-                        )
-
-                        if check_result.returncode == 0:
-                            sessions.append({
-                                'type': file.stem.replace('.tmux-', '').replace('-session', ''),
-                                'data': data
-                            })
+                    if data.get('session') in live:
+                        sessions.append({
+                            'type': file.name[len('.tmux-'):-len('-session.json')],
+                            'data': data
+                        })
             except Exception:
                 continue
 
@@ -293,11 +475,7 @@ def load_tmux_sessions():
             return "📋 No active development sessions found"
 
         # Format as table
-        lines = [
-            "═══════════════════════════════════════════════════════════════",
-            "  Active Development Sessions",
-            "═══════════════════════════════════════════════════════════════",
-        ]
+        lines = [_TABLE_SEP, "  Active Development Sessions", _TABLE_SEP]
 
         for sess in sessions:
             data = sess['data']
@@ -316,7 +494,7 @@ def load_tmux_sessions():
 
             lines.append(f"  Attach: tmux attach -t {data.get('session')}")
 
-        lines.append("\n═══════════════════════════════════════════════════════════════")
+        lines.append("\n" + _TABLE_SEP)
 
         return "\n".join(lines)
 
@@ -334,10 +512,15 @@ def main():
                           help='Announce session start via TTS')
         parser.add_argument('--git-status', action='store_true',
                           help='Run git status and display current repository state')
+        parser.add_argument('--check-orphans', action=argparse.BooleanOptionalAction, default=True,
+                          help='Warn about agent sessions whose tmux session has died (default: on)')
         args = parser.parse_args()
         
+        # CI runners have no tmux server or agent worktrees and nobody to hear TTS
+        in_ci = bool(os.environ.get('CI') or os.environ.get('GITHUB_ACTIONS'))
+
         # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = _loads(sys.stdin.buffer.read())
         
         # Extract fields
         session_id = input_data.get('session_id', 'unknown')
@@ -347,47 +530,31 @@ def main():
         log_session_start(input_data)
         
         # Run git status if requested
-        if args.git_status:
-            git_status_info = []
-            try:
-                # Run git status --porcelain for machine-readable output
-                status_result = subprocess.run(
-                    ['git', 'status', '--porcelain', '--branch'],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if status_result.returncode == 0:
-                    git_output = status_result.stdout.strip()
-                    if git_output:
-                        git_status_info.append(f"Git Status:\n{git_output}")
-                    
-                    # Also run a more detailed status for human readability
-                    detailed_result = subprocess.run(
-                        ['git', 'status', '--short'],
-                        capture_output=True,
-                        text=True,
-                        timeout=10
-                    )
-                    
-                    if detailed_result.returncode == 0 and detailed_result.stdout.strip():
-                        git_status_info.append(f"Changes Summary:\n{detailed_result.stdout.strip()}")
+        # git, tmux and the agent metadata scan are independent and I/O bound,
+        # so run them side by side rather than back to back
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            # Back-to-back runs reuse results from the last few seconds
+            def cached(key, fn):
+                return executor.submit(_cached_or_compute, key, CACHE_TTL_SECONDS, fn)
+
+            git_future = cached("git_status", run_git_status) if args.git_status else None
+            tmux_future = (cached("tmux_sessions", load_tmux_sessions)
+                           if not in_ci and _which('tmux') else None)
+            orphan_future = (cached("orphaned_sessions", check_orphaned_agent_sessions)
+                             if args.check_orphans and not in_ci else None)
+
+            if git_future:
+                # One git invocation feeds both the status and the changes summary
+                status = git_future.result()
+                if status is not None:
+                    git_status_info = format_git_status(status)
                 else:
-                    git_status_info.append("Git status unavailable (not a git repository or git not found)")
-                    
-            except Exception as e:
-                git_status_info.append(f"Failed to run git status: {e}")
-            
-            # Store git status for potential combination with tmux sessions
-            # (Don't exit yet, combine with tmux sessions below)
+                    git_status_info = ["Git status unavailable (not a git repository or git not found)"]
 
-        # Always load tmux sessions
-        tmux_sessions = load_tmux_sessions()
+            tmux_sessions = tmux_future.result() if tmux_future else None
 
-        # Check for orphaned agent sessions
-        orphaned_sessions = check_orphaned_agent_sessions()
-        orphan_warning = format_orphan_warning(orphaned_sessions)
+            # Check for orphaned agent sessions
+            orphan_warning = format_orphan_warning(orphan_future.result()) if orphan_future else None
 
         # Combine git status (if requested) with tmux sessions and orphan warning
         context_parts = []
@@ -409,7 +576,7 @@ def main():
                     "additionalContext": "\n\n".join(context_parts)
                 }
             }
-            print(json.dumps(output))
+            sys.stdout.buffer.write(_dumps(output) + b'\n')
             sys.exit(0)
 
         # Load development context if requested
@@ -423,11 +590,11 @@ def main():
                         "additionalContext": context
                     }
                 }
-                print(json.dumps(output))
+                sys.stdout.buffer.write(_dumps(output) + b'\n')
                 sys.exit(0)
         
         # Announce session start if requested
-        if args.announce:
+        if args.announce and not in_ci:
             try:
                 # Try to use TTS to announce session start
                 script_dir = Path(__file__).parent
@@ -7,9 +7,20 @@ Simple, reliable Python implementation that handles all input cases gracefully
 import sys
 import json
 import os
+import hashlib
+import itertools
 import subprocess
+import tempfile
+import time
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads  # orjson is optional; accepts the same bytes/str input
+
 # ANSI color codes
 COLORS = {
     'cyan': '\033[36m',
@@ -22,52 +33,288 @@ COLORS = {
     'reset': '\033[0m'
 }
 
-def run_git_command(cmd, cwd=None):
-    """Run a git command and return output, empty string on error"""
+# Format templates wrapping text in a color and a reset, e.g. WRAP['cyan'].format(name)
+WRAP = {name: f"{code}{{}}{COLORS['reset']}" for name, code in COLORS.items() if name != 'reset'}
+
+# Plain C locale, and don't let status take the index lock - a statusline
+# render must never make a concurrent git command wait
+GIT_ENV = {**os.environ, 'LC_ALL': 'C', 'GIT_OPTIONAL_LOCKS': '0'}
+
+# Statusline input is one small JSON object; anything past this is not read
+STDIN_LIMIT = 64 * 1024
+
+# Home directory, resolved once for replace_home_with_tilde
+HOME = os.path.expanduser('~')
+
+# Seconds a cached git result stays valid while .git/index and .git/HEAD are unchanged
+GIT_CACHE_TTL = 2
+
+# Transcripts are read backwards in chunks, giving up after the last TRANSCRIPT_TAIL_LIMIT bytes
+# (but never before one complete line has been seen)
+TRANSCRIPT_CHUNK_SIZE = 4096
+TRANSCRIPT_TAIL_LIMIT = 256 * 1024
+
+# Usage objects are a few hundred bytes; this slice of the line always holds one
+USAGE_SLICE_SIZE = 2048
+USAGE_DECODER = json.JSONDecoder()
+
+# The first user message is looked for in this many leading transcript lines
+SUMMARY_SCAN_LINES = 50
+
+def run_git_command(argv, cwd=None):
+    """Run a git command given as an argv tuple and return output, empty string on error"""
     try:
         result = subprocess.run(
-            cmd.split(),
+            argv,
             cwd=cwd or os.getcwd(),
+            env=GIT_ENV,
             capture_output=True,
             text=True,
             timeout=0.5
         )
         return result.stdout.strip() if result.returncode == 0 else ''
-    except:
+    except (subprocess.SubprocessError, OSError):
         return ''
 
+def find_git_dir(cwd):
+    """Return (work tree root, git dir) for the repo containing cwd, or None outside a repo"""
+    path = Path(cwd).resolve()
+    for directory in (path, *path.parents):
+        git_path = directory / '.git'
+        if git_path.is_dir():
+            return directory, git_path
+        if git_path.is_file():
+            # Worktrees and submodules point at their real git dir
+            try:
+                content = git_path.read_text().strip()
+            except OSError:
+                return None
+            if content.startswith('gitdir:'):
+                return directory, directory / content[len('gitdir:'):].strip()
+            return None
+    return None
+
+def read_git_branch(git_dir):
+    """Current branch from HEAD, or 'HEAD' when detached"""
+    try:
+        head = (git_dir / 'HEAD').read_text().strip()
+    except OSError:
+        return 'HEAD'
+    if head.startswith('ref: refs/heads/'):
+        return head[len('ref: refs/heads/'):]
+    return 'HEAD'
+
+def git_cache_key(git_dir):
+    """mtimes of the index and HEAD - both change on staging, commits and checkouts"""
+    try:
+        return [os.stat(git_dir / 'index').st_mtime_ns, os.stat(git_dir / 'HEAD').st_mtime_ns]
+    except OSError:
+        return None
+
+def get_git_info(cwd):
+    """Return (git_root, branch, changes_count), or None outside a git repo.
+
+    The root and branch come straight from the .git directory; only the
+    changes count needs a git process. Results are cached in a temp file for
+    GIT_CACHE_TTL seconds, as long as the index and HEAD are unchanged, so
+    idle redraws skip git entirely.
+    """
+    found = find_git_dir(cwd)
+    if found is None:
+        return None
+    git_root, git_dir = found
+
+    cache_file = Path(tempfile.gettempdir()) / f"claude_statusline_{hashlib.sha1(cwd.encode()).hexdigest()[:16]}.json"
+    key = git_cache_key(git_dir)
+
+    if key is not None:
+        try:
+            with open(cache_file, 'r') as f:
+                cached = json.load(f)
+            if cached['key'] == key and time.time() - cached['time'] < GIT_CACHE_TTL:
+                return tuple(cached['info'])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    branch = read_git_branch(git_dir)
+    status_output = run_git_command(('git', 'status', '--porcelain'), cwd)
+    changes_count = status_output.count('\n') + 1 if status_output else 0
+    info = (str(git_root), branch, changes_count)
+
+    if key is not None:
+        try:
+            tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump({'key': key, 'time': time.time(), 'info': info}, f)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass  # Caching is best effort
+
+    return info
+
+def usage_tokens(line):
+    """Total tokens from an assistant transcript entry, or None for any other line"""
+    # Most lines are tool results and user turns - reject them without parsing
+    if b'"usage"' not in line or b'"assistant"' not in line:
+        return None
+    
+    # Assistant lines end their message with the usage object, so decode just
+    # that instead of the whole (often huge) line. Tool results can embed
+    # other usage objects, so anything unusual takes the full parse below.
+    if b'"role":"assistant"' in line and b'"toolUseResult"' not in line:
+        start = line.rfind(b'"usage"') + len(b'"usage"')
+        brace = line.find(b'{', start)
+        if brace != -1 and line[start:brace].strip() == b':':
+            try:
+                usage, _ = USAGE_DECODER.raw_decode(line[brace:brace + USAGE_SLICE_SIZE].decode('utf-8', 'ignore'))
+                return usage.get('input_tokens', 0) + usage.get('output_tokens', 0)
+            except (ValueError, TypeError, AttributeError):
+                pass
+    
+    try:
+        entry = _loads(line)
+        if 'message' in entry and 'usage' in entry['message']:
+            usage = entry['message']['usage']
+            if entry['message'].get('role') == 'assistant':
+                input_tokens = usage.get('input_tokens', 0)
+                output_tokens = usage.get('output_tokens', 0)
+                return input_tokens + output_tokens
+    except (ValueError, TypeError, AttributeError, KeyError):
+        pass
+    return None
+
+def scan_tail_tokens(f, end):
+    """Latest usage found walking back from end a chunk at a time, 0 if none"""
+    # The newest usage is almost always on the last line, so one small read usually suffices
+    pos = end
+    stop = max(0, pos - TRANSCRIPT_TAIL_LIMIT)
+    partial = b''
+    seen_line = False
+    # A last line longer than the limit is still read to its start
+    while pos > stop or (pos > 0 and not seen_line):
+        # Grow reads with the pending partial line so a huge line isn't rebuilt chunk by chunk
+        read_size = min(max(TRANSCRIPT_CHUNK_SIZE, len(partial)), pos - stop if pos > stop else pos)
+        pos -= read_size
+        f.seek(pos)
+        lines = (f.read(read_size) + partial).split(b'\n')
+        # The first piece may be the tail of a longer line, unless we hit the start
+        partial = lines.pop(0) if pos > 0 else b''
+        for line in reversed(lines):
+            if not line.strip():
+                continue
+            seen_line = True
+            tokens = usage_tokens(line)
+            if tokens is not None:
+                return tokens
+    return 0
+
+def scan_appended_tokens(f, offset, end):
+    """Latest usage in the complete lines between offset and end, and where parsing stopped"""
+    f.seek(offset)
+    lines = f.read(end - offset).split(b'\n')
+    # Leave a trailing partial line for the next render
+    next_offset = end - len(lines.pop())
+    for line in reversed(lines):
+        tokens = usage_tokens(line) if line.strip() else None
+        if tokens is not None:
+            return tokens, next_offset
+    return None, next_offset
+
 def get_context_tokens(transcript_path):
-    """Calculate actual token usage from transcript"""
-    if not transcript_path or not Path(transcript_path).exists():
+    """Calculate actual token usage from transcript
+
+    The result is cached per transcript with the byte offset parsed so far:
+    an unchanged file costs one fstat, and a grown file only has its
+    appended lines parsed.
+    """
+    if not transcript_path:
         return 0
     
+    cache_file = Path(tempfile.gettempdir()) / f"claude_ctx_tokens_{hashlib.sha1(transcript_path.encode()).hexdigest()[:16]}.json"
+    try:
+        with open(cache_file, 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+    
     try:
-        # Read last few KB of file for performance
         with open(transcript_path, 'rb') as f:
-            f.seek(0, 2)  # Go to end
-            file_size = f.tell()
-            read_size = min(8192, file_size)
-            f.seek(max(0, file_size - read_size))
-            data = f.read().decode('utf-8', errors='ignore')
-        
-        # Find the most recent usage info
-        lines = data.strip().split('\n')
-        for line in reversed(lines[-30:]):  # Check last 30 lines
+            st = os.fstat(f.fileno())
+            same_file = cached.get('inode') == st.st_ino and cached.get('size', -1) <= st.st_size
+            if same_file and cached['size'] == st.st_size:
+                return cached['tokens']
+            
+            if same_file and st.st_size - cached['offset'] <= TRANSCRIPT_TAIL_LIMIT:
+                tokens, offset = scan_appended_tokens(f, cached['offset'], st.st_size)
+                if tokens is None:
+                    tokens = cached['tokens']
+            else:
+                # New, truncated or much larger transcript - start from the tail,
+                # keeping the last known count if the tail holds no usage
+                tokens = scan_tail_tokens(f, st.st_size) or (cached.get('tokens', 0) if same_file else 0)
+                offset = st.st_size
+    except (OSError, TypeError, AttributeError, KeyError):
+        return 0
+    
+    try:
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({'inode': st.st_ino, 'size': st.st_size, 'offset': offset, 'tokens': tokens}, f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass  # Caching is best effort
+    
+    return tokens
+
+def get_session_summary(transcript_path):
+    """First user message of the transcript, shortened to 50 chars, or '' if none
+
+    Only the first SUMMARY_SCAN_LINES lines are read, and a found summary is
+    cached per transcript since the first message never changes.
+    """
+    cache_file = Path(tempfile.gettempdir()) / f"claude_summary_{hashlib.sha1(transcript_path.encode()).hexdigest()[:16]}.json"
+    try:
+        with open(transcript_path, 'r') as f:
+            st = os.fstat(f.fileno())
             try:
-                entry = json.loads(line)
-                if 'message' in entry and 'usage' in entry['message']:
-                    usage = entry['message']['usage']
-                    if entry['message'].get('role') == 'assistant':
-                        input_tokens = usage.get('input_tokens', 0)
-                        output_tokens = usage.get('output_tokens', 0)
-                        total_tokens = input_tokens + output_tokens
-                        return total_tokens
-            except:
-                continue
-    except:
-        pass
+                with open(cache_file, 'r') as cf:
+                    cached = json.load(cf)
+                # Transcripts only grow, so a shrunk file has been rewritten
+                if cached['inode'] == st.st_ino and cached['size'] <= st.st_size:
+                    return cached['summary']
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+            
+            # Try to get first user message for summary
+            for line in itertools.islice(f, SUMMARY_SCAN_LINES):
+                try:
+                    entry = _loads(line)
+                    if entry.get('message', {}).get('role') == 'user':
+                        content = entry['message'].get('content', '')
+                        if isinstance(content, list):
+                            for item in content:
+                                if item.get('type') == 'text':
+                                    content = item.get('text', '')
+                                    break
+                        if content:
+                            summary = content[:50].replace('\n', ' ').strip()
+                            if len(content) > 50:
+                                summary += '...'
+                            break
+                except (ValueError, TypeError, AttributeError, KeyError):
+                    continue
+            else:
+                return ''
+    except (OSError, ValueError):
+        return ''
     
-    return 0
+    try:
+        with open(cache_file, 'w') as f:
+            json.dump({'inode': st.st_ino, 'size': st.st_size, 'summary': summary}, f)
+    except OSError:
+        pass  # Caching is best effort
+    
+    return summary
 
 def get_model_short_name(model_info):
     """Extract short model name from model object or string"""
@@ -77,11 +324,17 @@ def get_model_short_name(model_info):
     else:
         model_name = str(model_info)
     
-    if 'opus' in model_name.lower():
+    return short_name_for(str(model_name))
+
+@lru_cache(maxsize=8)
+def short_name_for(model_name):
+    """Map a model name or id to its family name"""
+    lowered = model_name.lower()
+    if 'opus' in lowered:
         return 'Opus'
-    elif 'sonnet' in model_name.lower():
-        return 'Sonnet' 
-    elif 'haiku' in model_name.lower():
+    elif 'sonnet' in lowered:
+        return 'Sonnet'
+    elif 'haiku' in lowered:
         return 'Haiku'
     return 'Claude'
 
@@ -98,9 +351,8 @@ def format_token_count(tokens):
 
 def replace_home_with_tilde(path):
     """Replace home directory with ~ in path"""
-    home = os.path.expanduser('~')
-    if path.startswith(home):
-        return path.replace(home, '~', 1)
+    if path.startswith(HOME):
+        return '~' + path[len(HOME):]
     return path
 
 def build_statusline():
@@ -108,10 +360,10 @@ def build_statusline():
     # Parse input - handle all cases
     input_data = {}
     try:
-        raw_input = sys.stdin.read()
+        raw_input = sys.stdin.read(STDIN_LIMIT)
         if raw_input.strip():
-            input_data = json.loads(raw_input)
-    except:
+            input_data = _loads(raw_input)
+    except (OSError, ValueError):
         pass  # Use defaults
     
     # Extract values with defaults
@@ -127,59 +379,55 @@ def build_statusline():
     display_cwd = replace_home_with_tilde(cwd)
     
     # Check if we're in a git repo
-    git_root = run_git_command('git rev-parse --show-toplevel', cwd)
+    git_info = get_git_info(cwd)
     
-    if not git_root:
+    if not git_info:
         # Not in git repo - simple status with current directory and model
         dir_name = Path(display_cwd).name
         tokens = get_context_tokens(transcript_path)
         token_display = format_token_count(tokens)
         
         components = []
-        components.append(f"{COLORS['cyan']}{dir_name}{COLORS['reset']}")
-        components.append(f"{COLORS['orange']}{model_short}{COLORS['reset']}")
+        components.append(WRAP['cyan'].format(dir_name))
+        components.append(WRAP['orange'].format(model_short))
         if tokens > 0:
-            components.append(f"{COLORS['gray']}{token_display} tokens{COLORS['reset']}")
+            components.append(WRAP['gray'].format(f"{token_display} tokens"))
         
         return ' | '.join(components)
     
     # Get git information
-    branch = run_git_command('git branch --show-current', cwd) or 'HEAD'
-    
-    # Count git changes
-    status_output = run_git_command('git status --porcelain', cwd)
-    changes_count = len(status_output.split('\n')) if status_output else 0
+    git_root, branch, changes_count = git_info
     
     # Build components
     components = []
     
     # Project directory
     project_name = Path(git_root).name
-    components.append(f"{COLORS['cyan']}{project_name}{COLORS['reset']}")
+    components.append(WRAP['cyan'].format(project_name))
     
     # Git branch with color
     if branch in ['main', 'master']:
-        branch_color = COLORS['green']
+        branch_color = WRAP['green']
     elif branch.startswith('feature/'):
-        branch_color = COLORS['cyan']
+        branch_color = WRAP['cyan']
     elif branch.startswith('fix/'):
-        branch_color = COLORS['orange']
+        branch_color = WRAP['orange']
     elif branch.startswith('hotfix/'):
-        branch_color = COLORS['red']
+        branch_color = WRAP['red']
     else:
-        branch_color = COLORS['magenta']
+        branch_color = WRAP['magenta']
     
-    components.append(f"{branch_color}{branch}{COLORS['reset']}")
+    components.append(branch_color.format(branch))
     
     # Git changes
     if changes_count > 0:
         if changes_count > 10:
-            change_color = COLORS['red']
+            change_color = WRAP['red']
         elif changes_count > 5:
-            change_color = COLORS['yellow']
+            change_color = WRAP['yellow']
         else:
-            change_color = COLORS['green']
-        components.append(f"{change_color}+{changes_count}{COLORS['reset']}")
+            change_color = WRAP['green']
+        components.append(change_color.format(f"+{changes_count}"))
     
     # Model and token usage
     tokens = get_context_tokens(transcript_path)
@@ -187,43 +435,23 @@ def build_statusline():
     
     # Color based on token usage (rough thresholds)
     if tokens > 150000:
-        token_color = COLORS['red']
+        token_color = WRAP['red']
     elif tokens > 100000:
-        token_color = COLORS['yellow']
+        token_color = WRAP['yellow']
     else:
-        token_color = COLORS['green']
+        token_color = WRAP['green']
     
-    model_component = f"{COLORS['orange']}{model_short}{COLORS['reset']}"
+    model_component = WRAP['orange'].format(model_short)
     if tokens > 0:
-        model_component += f" {token_color}{token_display} tokens{COLORS['reset']}"
+        model_component += " " + token_color.format(f"{token_display} tokens")
     
     components.append(model_component)
     
     # Session summary (optional - if token usage > 10k)
-    if tokens > 10000 and transcript_path and Path(transcript_path).exists():
-        try:
-            # Try to get first user message for summary
-            with open(transcript_path, 'r') as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line)
-                        if entry.get('message', {}).get('role') == 'user':
-                            content = entry['message'].get('content', '')
-                            if isinstance(content, list):
-                                for item in content:
-                                    if item.get('type') == 'text':
-                                        content = item.get('text', '')
-                                        break
-                            if content:
-                                summary = content[:50].replace('\n', ' ').strip()
-                                if len(content) > 50:
-                                    summary += '...'
-                                components.append(f"{COLORS['gray']}# {summary}{COLORS['reset']}")
-                                break
-                    except:
-                        continue
-        except:
-            pass
+    if tokens > 10000 and transcript_path:
+        summary = get_session_summary(transcript_path)
+        if summary:
+            components.append(WRAP['gray'].format(f"# {summary}"))
     
     return ' | '.join(components)
 
@@ -234,5 +462,5 @@ if __name__ == '__main__':
         sys.stdout.flush()
     except Exception as e:
         # On any error, show a simple fallback
-        sys.stdout.write(f"{COLORS['red']}status error{COLORS['reset']}")
+        sys.stdout.write(WRAP['red'].format("status error"))
         sys.stdout.flush()
@@ -10,22 +10,56 @@
 # ABOUTME: Test suite for Claude Code hooks to ensure they trigger expected behaviors
 # Tests the pre_compact handover trigger and session_start git status functionality
 
+import io
 import json
+import runpy
 import subprocess
+import sys
 import tempfile
 import os
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 
+HOOKS_DIR = Path(__file__).parent
+
+
+def run_hook(hook_name, args, test_input, monkeypatch, capsys, tmp_path):
+    """
+    Run a hook script in-process as __main__ with test_input on stdin.
+
+    Runs from tmp_path so the hook's logs/ stay out of the repo, and restores
+    os.environ afterwards since hooks call load_dotenv().
+
+    Returns (exit code, stdout). Avoids paying uv + interpreter startup per
+    test; TestHooksIntegration still runs the scripts through uv.
+    """
+    hook_path = HOOKS_DIR / hook_name
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", [str(hook_path), *args])
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(json.dumps(test_input).encode())))
+
+    environ = dict(os.environ)
+    exit_code = 0
+    try:
+        runpy.run_path(str(hook_path), run_name="__main__")
+    except SystemExit as e:
+        exit_code = e.code or 0
+    finally:
+        os.environ.clear()
+        os.environ.update(environ)
+
+    return exit_code, capsys.readouterr().out
+
+
 class TestPreCompactHook:
     """Test pre_compact.py hook triggers /handover command."""
     
-    def test_pre_compact_triggers_handover_command(self):
+    def test_pre_compact_triggers_handover_command(self, monkeypatch, capsys, tmp_path):
         """Test that pre_compact hook triggers /handover command when --handover flag is used."""
         # Arrange
-        hook_path = Path(__file__).parent / "pre_compact.py"
         test_input = {
             "session_id": "test-session-123",
             "transcript_path": "/path/to/transcript.jsonl", 
@@ -34,23 +68,16 @@ class TestPreCompactHook:
         }
         
         # Act
-        result = subprocess.run([
-            "uv", "run", str(hook_path), "--handover"
-        ], 
-        input=json.dumps(test_input),
-        text=True,
-        capture_output=True
-        )
+        returncode, stdout = run_hook("pre_compact.py", ["--handover"], test_input, monkeypatch, capsys, tmp_path)
         
         # Assert - Should trigger handover command via JSON output
-        assert result.returncode == 0
-        assert "hookSpecificOutput" in result.stdout
-        assert "handover" in result.stdout.lower()
+        assert returncode == 0
+        assert "hookSpecificOutput" in stdout
+        assert "handover" in stdout.lower()
     
-    def test_pre_compact_without_handover_flag_works_normally(self):
+    def test_pre_compact_without_handover_flag_works_normally(self, monkeypatch, capsys, tmp_path):
         """Test that pre_compact hook works normally without --handover flag."""
         # Arrange
-        hook_path = Path(__file__).parent / "pre_compact.py"
         test_input = {
             "session_id": "test-session-456",
             "transcript_path": "/path/to/transcript.jsonl",
@@ -58,67 +85,62 @@ class TestPreCompactHook:
         }
         
         # Act
-        result = subprocess.run([
-            "uv", "run", str(hook_path), "--verbose"
-        ],
-        input=json.dumps(test_input),
-        text=True, 
-        capture_output=True
-        )
+        returncode, stdout = run_hook("pre_compact.py", ["--verbose"], test_input, monkeypatch, capsys, tmp_path)
         
         # Assert - Should work normally without handover
-        assert result.returncode == 0
-        assert "/handover" not in result.stdout
+        assert returncode == 0
+        assert "/handover" not in stdout
 
 
 class TestSessionStartHook:
     """Test session_start.py hook runs git status."""
     
-    def test_session_start_runs_git_status(self):
+    def test_session_start_runs_git_status(self, monkeypatch, capsys, tmp_path):
         """Test that session_start hook runs git status when --git-status flag is used."""
         # Arrange
-        hook_path = Path(__file__).parent / "session_start.py"
         test_input = {
             "session_id": "session-789",
             "source": "startup"
         }
+        # The hook runs in tmp_path, so give it a repository to report on
+        subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
         
         # Act
-        result = subprocess.run([
-            "uv", "run", str(hook_path), "--git-status"
-        ],
-        input=json.dumps(test_input),
-        text=True,
-        capture_output=True
-        )
+        returncode, stdout = run_hook("session_start.py", ["--git-status"], test_input, monkeypatch, capsys, tmp_path)
         
         # Assert - Should run git status via JSON output
-        assert result.returncode == 0
+        assert returncode == 0
         # Should contain git status information in JSON format
-        assert "hookSpecificOutput" in result.stdout
-        output_lower = result.stdout.lower()
+        assert "hookSpecificOutput" in stdout
+        output_lower = stdout.lower()
         assert any(word in output_lower for word in ["git", "status", "branch", "changes"])
     
-    def test_session_start_without_git_flag_works_normally(self):
+    def test_session_start_without_git_flag_works_normally(self, monkeypatch, capsys, tmp_path):
         """Test that session_start hook works normally without --git-status flag."""
         # Arrange  
-        hook_path = Path(__file__).parent / "session_start.py"
         test_input = {
             "session_id": "session-101112", 
             "source": "resume"
         }
         
         # Act
-        result = subprocess.run([
-            "uv", "run", str(hook_path)
-        ],
-        input=json.dumps(test_input),
-        text=True,
-        capture_output=True
-        )
+        returncode, _ = run_hook("session_start.py", [], test_input, monkeypatch, capsys, tmp_path)
         
         # Assert - Should work normally
-        assert result.returncode == 0
+        assert returncode == 0
+
+    def test_session_start_appends_jsonl_log(self, monkeypatch, capsys, tmp_path):
+        """Test that each session_start run appends one line to logs/session_start.jsonl."""
+        # Act
+        for session_id in ("log-1", "log-2"):
+            returncode, _ = run_hook(
+                "session_start.py", [], {"session_id": session_id, "source": "startup"}, monkeypatch, capsys, tmp_path
+            )
+            assert returncode == 0
+
+        # Assert - One JSON object per line, in order
+        lines = (tmp_path / "logs" / "session_start.jsonl").read_text().splitlines()
+        assert [json.loads(line)["session_id"] for line in lines] == ["log-1", "log-2"]
 
 
 class TestHooksIntegration:
@@ -134,14 +156,6 @@ class TestHooksIntegration:
             "trigger": "manual"
         }
         
-        pre_compact_result = subprocess.run([
-            "uv", "run", str(pre_compact_path)
-        ],
-        input=json.dumps(pre_compact_input),
-        text=True,
-        capture_output=True
-        )
-        
         # Test session_start hook
         session_start_path = Path(__file__).parent / "session_start.py" 
         session_start_input = {
@@ -149,13 +163,24 @@ class TestHooksIntegration:
             "source": "startup"
         }
         
-        session_start_result = subprocess.run([
-            "uv", "run", str(session_start_path)
-        ],
-        input=json.dumps(session_start_input),
-        text=True,
-        capture_output=True
-        )
+        # The two hooks are independent, so launch them side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pre_compact_future = executor.submit(
+                subprocess.run,
+                ["uv", "run", str(pre_compact_path)],
+                input=json.dumps(pre_compact_input),
+                text=True,
+                capture_output=True
+            )
+            session_start_future = executor.submit(
+                subprocess.run,
+                ["uv", "run", str(session_start_path)],
+                input=json.dumps(session_start_input),
+                text=True,
+                capture_output=True
+            )
+            pre_compact_result = pre_compact_future.result()
+            session_start_result = session_start_future.result()
         
         # Assert both work independently
         assert pre_compact_result.returncode == 0
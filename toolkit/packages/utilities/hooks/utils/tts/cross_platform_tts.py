@@ -2,61 +2,94 @@
 # /// script
 # requires-python = ">=3.8"
 # dependencies = [
-#     "pyttsx3>=2.90",
+#     "pyttsx3>=2.90; sys_platform != 'darwin'",
+#     "pywin32; sys_platform == 'win32'",
 # ]
 # ///
 
 # ABOUTME: Cross-platform TTS script that automatically selects the best TTS method based on OS
 # Uses macOS 'say' command, Windows SAPI, or falls back to pyttsx3 for maximum compatibility
 
+import os
 import sys
 import subprocess
-import platform
-import random
 import shutil
+import time
+from functools import lru_cache
 
+# sys.platform is a plain attribute; platform.system() can shell out on first use
+_SYS = sys.platform
+_PLATFORM_NAME = {"darwin": "Darwin", "win32": "Windows", "linux": "Linux"}.get(_SYS, _SYS)
+
+@lru_cache(maxsize=None)
+def _which(command):
+    """Absolute path of a TTS command, resolved once so exec skips the PATH search."""
+    return shutil.which(command)
+
+@lru_cache(maxsize=1)
 def get_platform_tts_method():
-    """Detect the best TTS method for the current platform."""
-    system = platform.system().lower()
-    
-    if system == "darwin":  # macOS
+    """Detect the best TTS method for the current platform (probed once per process)."""
+    if _SYS == "darwin":  # macOS
         # Check if 'say' command is available
-        if shutil.which('say'):
+        if _which('say'):
             return "macos_say"
-    elif system == "windows":
+    elif _SYS.startswith("win"):
         # Windows has built-in SAPI
         return "windows_sapi" 
-    elif system == "linux":
+    elif _SYS.startswith("linux"):
         # Check for common Linux TTS commands
-        if shutil.which('espeak'):
+        if _which('espeak'):
             return "linux_espeak"
-        elif shutil.which('spd-say'):
+        elif _which('spd-say'):
             return "linux_spd_say"
-        elif shutil.which('festival'):
+        elif _which('festival'):
             return "linux_festival"
     
     # Fall back to pyttsx3 for all platforms
     return "pyttsx3"
 
-def speak_macos(text):
-    """Use macOS native 'say' command."""
+def spawn_detached(argv, stdin_text=None):
+    """Start a TTS command in its own session and return without waiting for the audio."""
     try:
-        result = subprocess.run(['say', text], 
-                              capture_output=True, 
-                              text=True, 
-                              timeout=30)
-        return result.returncode == 0
+        proc = subprocess.Popen(argv,
+                              stdin=subprocess.PIPE if stdin_text is not None else subprocess.DEVNULL,
+                              stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL,
+                              text=True,
+                              start_new_session=True)
+        if stdin_text is not None:
+            proc.stdin.write(stdin_text)
+            proc.stdin.close()
+        return True
     except Exception:
         return False
 
+def speak_macos(text):
+    """Use macOS native 'say' command."""
+    return spawn_detached([_which('say') or 'say', text])
+
 def speak_windows_sapi(text):
-    """Use Windows SAPI via PowerShell."""
+    """Use Windows SAPI, in-process via COM when pywin32 is available."""
     try:
-        # Use PowerShell to access Windows Speech API
-        ps_command = f'Add-Type -AssemblyName System.Speech; (New-Object System.Speech.Synthesis.SpeechSynthesizer).Speak("{text}")'
+        import win32com.client
+    except ImportError:
+        win32com = None
+    
+    if win32com is not None:
+        try:
+            win32com.client.Dispatch("SAPI.SpVoice").Speak(text)
+            return True
+        except Exception:
+            return False
+    
+    try:
+        # Fall back to PowerShell. The text goes through an environment variable
+        # so quotes or $(...) in it are never interpreted as script
+        ps_command = 'Add-Type -AssemblyName System.Speech; (New-Object System.Speech.Synthesis.SpeechSynthesizer).Speak($env:TTS_TEXT)'
         result = subprocess.run(['powershell', '-Command', ps_command],
-                              capture_output=True,
-                              text=True,
+                              env={**os.environ, 'TTS_TEXT': text},
+                              stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL,
                               timeout=30)
         return result.returncode == 0
     except Exception:
@@ -64,111 +97,111 @@ def speak_windows_sapi(text):
 
 def speak_linux_espeak(text):
     """Use Linux espeak command."""
-    try:
-        result = subprocess.run(['espeak', text],
-                              capture_output=True,
-                              text=True,
-                              timeout=30)
-        return result.returncode == 0
-    except Exception:
-        return False
+    return spawn_detached([_which('espeak') or 'espeak', text])
 
 def speak_linux_spd_say(text):
     """Use Linux spd-say command."""
-    try:
-        result = subprocess.run(['spd-say', text],
-                              capture_output=True,
-                              text=True,
-                              timeout=30)
-        return result.returncode == 0
-    except Exception:
-        return False
+    return spawn_detached([_which('spd-say') or 'spd-say', text])
 
 def speak_linux_festival(text):
     """Use Linux festival command."""
-    try:
-        # Festival expects text via stdin
-        result = subprocess.run(['festival', '--tts'],
-                              input=text,
-                              text=True,
-                              capture_output=True,
-                              timeout=30)
-        return result.returncode == 0
-    except Exception:
-        return False
+    # Festival expects text via stdin
+    return spawn_detached([_which('festival') or 'festival', '--tts'], stdin_text=text)
+
+@lru_cache(maxsize=1)
+def _pyttsx3_engine():
+    """pyttsx3 engine, initialised once - init() probes the platform speech drivers."""
+    import pyttsx3
+    return pyttsx3.init()
 
 def speak_pyttsx3(text):
     """Use pyttsx3 as fallback TTS."""
     try:
-        import pyttsx3
-        engine = pyttsx3.init()
+        engine = _pyttsx3_engine()
+    except ImportError:
+        return False  # Not installed on macOS, where 'say' is always present
+    except Exception:
+        return False
+    
+    try:
         engine.say(text)
         engine.runAndWait()
         return True
     except Exception:
         return False
 
+# TTS method name -> speak function
+METHOD_MAP = {
+    "macos_say": speak_macos,
+    "windows_sapi": speak_windows_sapi,
+    "linux_espeak": speak_linux_espeak,
+    "linux_spd_say": speak_linux_spd_say,
+    "linux_festival": speak_linux_festival,
+    "pyttsx3": speak_pyttsx3
+}
+
 def speak_text(text, method):
     """Speak text using the specified method."""
-    method_map = {
-        "macos_say": speak_macos,
-        "windows_sapi": speak_windows_sapi,
-        "linux_espeak": speak_linux_espeak,
-        "linux_spd_say": speak_linux_spd_say,
-        "linux_festival": speak_linux_festival,
-        "pyttsx3": speak_pyttsx3
-    }
-    
-    if method in method_map:
-        return method_map[method](text)
-    else:
-        return False
+    speak = METHOD_MAP.get(method)
+    return speak(text) if speak else False
+
+# Progress output is only useful when running the script by hand; hooks discard it
+VERBOSE = bool(os.environ.get("TTS_VERBOSE"))
+
+def log(message):
+    """Print progress output when TTS_VERBOSE is set."""
+    if VERBOSE:
+        print(message)
+
+# Default completion messages
+COMPLETION_MESSAGES = (
+    "Work complete!",
+    "All done!",
+    "Task finished!",
+    "Job complete!",
+    "Ready for next task!",
+    "Claude Code task completed!"
+)
 
 def main():
     try:
         # Detect platform and TTS method
         tts_method = get_platform_tts_method()
-        platform_name = platform.system()
+        platform_name = _PLATFORM_NAME
         
-        print(f"🎙️  Cross-Platform TTS ({platform_name})")
-        print("=" * 35)
-        print(f"🔧 Method: {tts_method}")
+        log(f"🎙️  Cross-Platform TTS ({platform_name})")
+        log("=" * 35)
+        log(f"🔧 Method: {tts_method}")
         
         # Get text from command line argument or use default
-        if len(sys.argv) > 1:
+        if len(sys.argv) == 2:
+            text = sys.argv[1]  # Hooks pass the message as a single argument
+        elif len(sys.argv) > 2:
             text = " ".join(sys.argv[1:])  # Join all arguments as text
         else:
-            # Default completion messages
-            completion_messages = [
-                "Work complete!",
-                "All done!",
-                "Task finished!",
-                "Job complete!",
-                "Ready for next task!",
-                "Claude Code task completed!"
-            ]
-            text = random.choice(completion_messages)
+            # Any varying number will do for picking a message; no PRNG to seed
+            text = COMPLETION_MESSAGES[time.time_ns() % len(COMPLETION_MESSAGES)]
         
-        print(f"🎯 Text: {text}")
-        print("🔊 Speaking...")
+        log(f"🎯 Text: {text}")
+        log("🔊 Speaking...")
         
         # Attempt to speak using the selected method
         success = speak_text(text, tts_method)
         
         if success:
-            print("✅ Speech completed!")
+            log("✅ Speech started!")
         else:
-            print(f"❌ {tts_method} failed, trying pyttsx3 fallback...")
+            log(f"❌ {tts_method} failed, trying pyttsx3 fallback...")
             # Try pyttsx3 as last resort
             if tts_method != "pyttsx3":
                 fallback_success = speak_pyttsx3(text)
                 if fallback_success:
-                    print("✅ Fallback speech completed!")
+                    log("✅ Fallback speech completed!")
                 else:
-                    print("❌ All TTS methods failed!")
+                    log("❌ All TTS methods failed!")
                     
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
 
 if __name__ == "__main__":
     main()